@@ -103,6 +103,85 @@ def retry_on_db_lock(max_retries=5, initial_delay=1.0, backoff_factor=2.0):
     return decorator
 
 
+def fast_bulk_update_rows(model, rows, fields, batch_size=10000):
+    """
+    Bulk update plain (pk, value, ...) tuples with a single UPDATE ... FROM (VALUES ...) per batch.
+    
+    Django's bulk_update() emits one CASE/WHEN expression per field that grows with
+    every row in the batch. On SQLite 3.33+ this helper instead joins the target
+    table against a VALUES table keyed by primary key, which is linear in the number
+    of rows. Callers pass the new values as rows (e.g. from values_list()), so no
+    model instances are built. Other backends fall back to bulk_update() on
+    lightweight pk-only instances.
+    
+    Args:
+        model: Django model class (e.g. Item)
+        rows (list): Tuples of (pk, value for fields[0], value for fields[1], ...)
+        fields (list): Names of the fields to write, in row order
+        batch_size (int): Maximum rows per statement (default: 10000). Further capped
+                          by the backend's query parameter limit.
+    
+    Returns:
+        int: Number of rows sent to the database
+    
+    Example:
+        fast_bulk_update_rows(Item, [(item_id, wdf, ocq, minqty)], ['weight_division_factor',
+                              'outer_case_quantity', 'minimum_qty'])
+    """
+    from django.db import connection
+    
+    rows = list(rows)
+    if not rows:
+        return 0
+    
+    meta = model._meta
+    update_fields = [meta.get_field(name) for name in fields]
+    
+    if connection.vendor != 'sqlite' or sqlite3.sqlite_version_info < (3, 33, 0):
+        objs = []
+        for row in rows:
+            obj = model(pk=row[0])
+            for field, value in zip(update_fields, row[1:]):
+                setattr(obj, field.attname, value)
+            objs.append(obj)
+        model.objects.bulk_update(objs, fields, batch_size=batch_size)
+        return len(objs)
+    
+    pk_field = meta.pk
+    quote = connection.ops.quote_name
+    
+    # One parameter per updated field plus the primary key for every row
+    row_width = len(update_fields) + 1
+    max_params = connection.features.max_query_params
+    if max_params:
+        batch_size = max(1, min(batch_size, max_params // row_width))
+    
+    value_columns = ['v_pk'] + [f'v_{i}' for i in range(len(update_fields))]
+    set_clause = ', '.join(
+        f"{quote(field.column)} = v.{value_columns[i + 1]}"
+        for i, field in enumerate(update_fields)
+    )
+    row_placeholder = '(' + ', '.join(['%s'] * row_width) + ')'
+    
+    with connection.cursor() as cursor:
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
+            params = []
+            for row in batch:
+                params.append(pk_field.get_db_prep_value(row[0], connection))
+                for field, value in zip(update_fields, row[1:]):
+                    params.append(field.get_db_prep_save(value, connection))
+            
+            cursor.execute(
+                f"WITH v({', '.join(value_columns)}) AS (VALUES {', '.join([row_placeholder] * len(batch))}) "
+                f"UPDATE {quote(meta.db_table)} SET {set_clause} "
+                f"FROM v WHERE {quote(meta.db_table)}.{quote(pk_field.column)} = v.v_pk",
+                params,
+            )
+    
+    return len(rows)
+
+
 def get_db_lock_info():
     """
     Get information about current database locks (for debugging/monitoring).
@@ -647,7 +647,9 @@ class ExportService:
                         # Update tracking fields
                         io.export_selling_price = current_selling_price
                         io.export_stock_status = current_stock_status
-                        io.save(update_fields=['export_selling_price', 'export_stock_status'])
+                    
+                    # One batched UPDATE instead of a save() per exported row
+                    ItemOutlet.objects.bulk_update(valid_items, ['export_selling_price', 'export_stock_status'], batch_size=1000)
                     
                     logger.info(
                         f"Updated delta export tracking for {len(valid_items)} items"
@@ -1,3 +1,5 @@
+from operator import attrgetter
+
 from django.core.management.base import BaseCommand
 from django.db.models import Count, Q
 from integration.models import Item
@@ -34,12 +36,10 @@ class Command(BaseCommand):
             query = query.filter(platform=platform_filter)
 
         # Group by (item_code, units) and find duplicates
+        group_key = attrgetter('item_code', 'units')
         duplicates_dict = {}
         for item in query:
-            key = (item.item_code, item.units)
-            if key not in duplicates_dict:
-                duplicates_dict[key] = []
-            duplicates_dict[key].append(item)
+            duplicates_dict.setdefault(group_key(item), []).append(item)
 
         # Filter only keys with multiple SKUs
         duplicate_keys = {k: v for k, v in duplicates_dict.items() if len(v) > 1}
@@ -51,16 +51,18 @@ class Command(BaseCommand):
         # Display results
         self.stdout.write(self.style.WARNING(f'\n🔍 Found {len(duplicate_keys)} item_code+units combinations with duplicate SKUs (wrap=10000 only):\n'))
 
+        # Detail lines are buffered and written once instead of one write per row
         results = []
+        lines = []
         for (item_code, units), items in sorted(duplicate_keys.items()):
-            self.stdout.write(f'\n📦 item_code={item_code} | units={units}')
-            self.stdout.write(f'   ({len(items)} duplicate SKUs):')
+            lines.append(f'\n📦 item_code={item_code} | units={units}')
+            lines.append(f'   ({len(items)} duplicate SKUs):')
             
             for idx, item in enumerate(items, 1):
                 sku_display = f'{item.sku}' if item.sku else '(empty)'
                 status_icon = '✓' if item.is_active else '✗'
                 
-                self.stdout.write(
+                lines.append(
                     f'   {idx}. SKU: {sku_display:<20} '
                     f'| MRP: {item.mrp:<8} '
                     f'| Cost: {item.cost:<8} '
@@ -80,6 +82,7 @@ class Command(BaseCommand):
                     'platform': item.platform,
                     'description': item.description,
                 })
+        self.stdout.write('\n'.join(lines))
 
         # Summary
         total_duplicate_items = sum(len(items) for items in duplicate_keys.values())
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-17 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integration', '0005_pushhistory'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['platform', 'item_code', 'units', 'sku'], name='integration_platfor_dbf034_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-17 11:21
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def analyze_item_table(apps, schema_editor):
+    # SQLite only picks an expression index over the plain (platform, ...) indexes
+    # once it has statistics for it
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('ANALYZE integration_item')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integration', '0006_item_platform_code_units_sku_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(models.F('platform'), django.db.models.functions.text.Lower('item_code'), django.db.models.functions.text.Lower('units'), name='item_code_units_ci_idx'),
+        ),
+        migrations.RunPython(analyze_item_table, migrations.RunPython.noop),
+    ]
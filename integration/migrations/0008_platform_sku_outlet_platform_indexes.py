@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-17 11:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integration', '0007_item_code_units_ci_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['platform', 'sku'], name='integration_platfor_da1b7a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outlet',
+            index=models.Index(fields=['platforms', 'is_active'], name='integration_platfor_0f5197_idx'),
+        ),
+    ]
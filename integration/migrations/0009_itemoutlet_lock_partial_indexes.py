@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-17 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integration', '0008_platform_sku_outlet_platform_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='itemoutlet',
+            index=models.Index(condition=models.Q(('price_locked', True)), fields=['outlet'], name='io_price_locked_partial'),
+        ),
+        migrations.AddIndex(
+            model_name='itemoutlet',
+            index=models.Index(condition=models.Q(('status_locked', True)), fields=['outlet'], name='io_status_locked_partial'),
+        ),
+    ]
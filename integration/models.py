@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import RegexValidator, MinValueValidator
 from django.utils import timezone
+from django.db.models.functions import Lower
+from .utils import outlet_enabled_status_expression
 import random
 import string
 
@@ -131,6 +133,9 @@ class Outlet(models.Model):
     class Meta:
         ordering = ['name']
         unique_together = ('name', 'platforms')  # Prevent duplicate names on same platform
+        indexes = [
+            models.Index(fields=['platforms', 'is_active']),  # Active outlets per platform
+        ]
 
 
 # Allowed wrap codes for items
@@ -315,11 +320,25 @@ class Item(models.Model):
         indexes = [
             models.Index(fields=['platform', 'is_active']),  # Dashboard query optimization
             models.Index(fields=['platform', 'item_code', 'units']),  # Product update CSV lookup optimization
+            models.Index(fields=['platform', 'item_code', 'units', 'sku']),  # Rules CSV (item_code, units, sku) lookup
+            models.Index(fields=['platform', 'sku']),  # Bulk creation SKU lookups
+            models.Index(  # Case-insensitive item_code/units lookup (price/lock APIs)
+                models.F('platform'), Lower('item_code'), Lower('units'),
+                name='item_code_units_ci_idx',
+            ),
         ]
         verbose_name = "Item"
         verbose_name_plural = "Items"
 
 
+# Expose LOWER() as a lookup on Item.item_code/units only (item_code__lower=...) so
+# case-insensitive item lookups compile to an equality that the functional index
+# above can serve. Registered per field instance, not on CharField, so other
+# models and apps are unaffected.
+Item._meta.get_field('item_code').register_lookup(Lower)
+Item._meta.get_field('units').register_lookup(Lower)
+
+
 class ItemOutlet(models.Model):
     """Intermediate model for Item-Outlet relationship with outlet-specific data
     
@@ -411,6 +430,14 @@ class ItemOutlet(models.Model):
         indexes = [
             models.Index(fields=['outlet', 'item']),
             models.Index(fields=['item']),  # For dashboard queries by item
+            models.Index(  # BLS price lock reports/validation (locked rows only)
+                fields=['outlet'], condition=models.Q(price_locked=True),
+                name='io_price_locked_partial',
+            ),
+            models.Index(  # BLS status lock reports/validation (locked rows only)
+                fields=['outlet'], condition=models.Q(status_locked=True),
+                name='io_status_locked_partial',
+            ),
         ]
         ordering = ['item__item_code', 'outlet__name']
         verbose_name = "Item-Outlet Association"
@@ -496,8 +523,6 @@ def _cascade_cls_status_to_outlets(item, new_val):
     - If new_val=True (LOCKED): Force disable all outlets (is_active_in_outlet=False)
     - If new_val=False (UNLOCKED): Enable outlets based on stock rules
     """
-    from .views import calculate_outlet_enabled_status
-    
     # Only cascade to outlets on the SAME platform as the item (STRICT ISOLATION)
     item_outlets = ItemOutlet.objects.filter(
         item=item,
@@ -511,12 +536,11 @@ def _cascade_cls_status_to_outlets(item, new_val):
             is_active_in_outlet=False
         )
     else:
-        # UNLOCKED: Enable based on stock rules for each outlet
-        for io in item_outlets:
-            calculated_enabled = calculate_outlet_enabled_status(item, io.outlet_stock)
-            io.status_locked = False
-            io.is_active_in_outlet = calculated_enabled
-            io.save(update_fields=['status_locked', 'is_active_in_outlet'])
+        # UNLOCKED: Enable based on stock rules, evaluated per row in one UPDATE
+        item_outlets.update(
+            status_locked=False,
+            is_active_in_outlet=outlet_enabled_status_expression(item)
+        )
 
 
 def _cascade_cls_price_to_outlets(item, new_val):
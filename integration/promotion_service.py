@@ -219,13 +219,14 @@ class PromotionService:
             
             # Find ALL items matching (item_code, units, platform) - there can be multiple with different SKUs
             # e.g., 9900127 KGS has SKU 9900127250 AND SKU 9900127100
-            items = Item.objects.filter(
+            # Fetched once: the emptiness check and the loop below share one SELECT
+            items = list(Item.objects.filter(
                 item_code=item_code,
                 units=units,
                 platform=platform
-            )
+            ))
             
-            if not items.exists():
+            if not items:
                 return {
                     'success': False,
                     'message': 'Item not found'
@@ -12,11 +12,10 @@ from datetime import datetime, date
 import json
 import logging
 import csv
-import io
 
 from .promotion_service import PromotionService
 from .models import Item, ItemOutlet, Outlet
-from .utils import decode_csv_upload, validate_wdf_for_division, validate_ocq_for_division
+from .utils import open_csv_upload, validate_wdf_for_division, validate_ocq_for_division
 
 logger = logging.getLogger(__name__)
 
@@ -336,8 +335,8 @@ def bulk_promotion_preview_api(request):
         end_date = timezone.make_aware(end_date_naive)
         
         # Decode CSV
-        csv_text, encoding = decode_csv_upload(csv_file)
-        csv_reader = csv.DictReader(io.StringIO(csv_text))
+        csv_stream, encoding = open_csv_upload(csv_file)
+        csv_reader = csv.DictReader(csv_stream)
         csv_data = list(csv_reader)
         
         # Import normalize_csv_header for BOM handling
@@ -451,8 +450,8 @@ def bulk_promotion_upload_api(request):
         end_date = timezone.make_aware(end_date_naive)
         
         # Decode CSV
-        csv_text, encoding = decode_csv_upload(csv_file)
-        csv_reader = csv.DictReader(io.StringIO(csv_text))
+        csv_stream, encoding = open_csv_upload(csv_file)
+        csv_reader = csv.DictReader(csv_stream)
         csv_data = list(csv_reader)
         
         # Import normalize_csv_header for BOM handling
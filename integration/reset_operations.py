@@ -89,6 +89,15 @@ class OutletResetEngine:
         ).select_related('item')
         
         total_count = queryset.count()
+        if not total_count:
+            # Nothing to reset - skip the preview and totals queries
+            return {
+                'total_count': 0,
+                'preview_items': [],
+                'total_price_value': Decimal('0.00'),
+                'total_stock_value': 0
+            }
+        
         preview_items = list(queryset[:limit])
         
         # Calculate financial impact
@@ -343,27 +352,24 @@ def validate_reset_operation(outlet, platform, reset_type):
     if not outlet.is_active:
         warnings.append("Outlet is currently inactive")
     
-    # Check if there are items to reset
-    item_count = ItemOutlet.objects.filter(
-        outlet=outlet,
-        outlet__platforms=platform
-    ).count()
-    
-    if item_count == 0:
-        warnings.append("No items found for this outlet - nothing to reset")
-    
-    # Check for locked items that might prevent reset
+    # Check if there are items to reset, and how many of them carry locks
+    # that might prevent reset - both answered by one aggregate query
     from django.db import models
-    locked_items = ItemOutlet.objects.filter(
+    counts = ItemOutlet.objects.filter(
         outlet=outlet,
         outlet__platforms=platform
-    ).filter(
-        models.Q(price_locked=True) | models.Q(status_locked=True) |
-        models.Q(item__price_locked=True) | models.Q(item__status_locked=True)
-    ).count()
+    ).aggregate(
+        item_count=models.Count('pk'),
+        locked_items=models.Count('pk', filter=(
+            models.Q(price_locked=True) | models.Q(status_locked=True) |
+            models.Q(item__price_locked=True) | models.Q(item__status_locked=True)
+        )),
+    )
     
-    if locked_items > 0:
-        warnings.append(f"{locked_items} items have locks that may prevent complete reset")
+    if counts['item_count'] == 0:
+        warnings.append("No items found for this outlet - nothing to reset")
+    elif counts['locked_items'] > 0:
+        warnings.append(f"{counts['locked_items']} items have locks that may prevent complete reset")
     
     return {
         'is_valid': len(errors) == 0,
@@ -4,10 +4,12 @@ Django Signals for Item Model
 Auto-set default values to prevent validation errors
 """
 
-from django.db.models.signals import pre_save
+from django.core.cache import cache
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from decimal import Decimal
-from .models import Item
+from .models import Item, Outlet
+from .utils import outlet_cache_key
 import logging
 
 logger = logging.getLogger(__name__)
@@ -65,3 +67,34 @@ def validate_wrap9900_has_wdf(sender, instance, **kwargs):
             if instance.weight_division_factor is None:
                 instance.weight_division_factor = Decimal('1')
                 logger.info(f"Auto-corrected WDF=1 for wrap=9900 item {instance.item_code} to prevent runtime crashes")
+
+
+@receiver(pre_save, sender=Outlet)
+def remember_previous_outlet_store_id(sender, instance, **kwargs):
+    """
+    Record the store_id stored before this save so its cache entry can be dropped too
+    
+    Without this, editing an outlet's store_id would leave the old store_id key
+    resolving to the outlet until OUTLET_CACHE_TIMEOUT expires.
+    """
+    instance._previous_store_id = None
+    if instance.pk:
+        instance._previous_store_id = Outlet.objects.filter(pk=instance.pk).values_list(
+            'store_id', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=Outlet)
+@receiver(post_delete, sender=Outlet)
+def invalidate_outlet_cache(sender, instance, **kwargs):
+    """
+    Drop the cached store_id -> Outlet entries used by the outlet price/lock APIs
+    
+    WHEN THIS RUNS:
+    - Outlet edits (name, platform, is_active, store_id, ...) via admin or views
+    - Outlet deletion
+    """
+    store_ids = {instance.store_id, getattr(instance, '_previous_store_id', None)}
+    keys = [outlet_cache_key(store_id) for store_id in store_ids if store_id]
+    if keys:
+        cache.delete_many(keys)
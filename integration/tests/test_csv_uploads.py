@@ -0,0 +1,82 @@
+import csv
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+
+from integration.models import Item
+from integration.utils import open_csv_upload
+from integration.views import fetch_items_by_csv_keys
+
+
+RULES_FIELDS = ('id', 'item_code', 'units', 'sku', 'weight_division_factor')
+
+
+class FetchItemsByCsvKeysTests(TestCase):
+    """fetch_items_by_csv_keys matches (item_code, units, sku) ignoring case"""
+
+    def setUp(self):
+        self.item = Item.objects.create(
+            platform='pasons', item_code='ABC100', description='Test item',
+            units='PCS', sku='Sku-1', wrap='9900',
+        )
+
+    def csv_row(self, item_code, units, sku, row_num=2):
+        return {'row_num': row_num, 'item_code': item_code, 'units': units, 'sku': sku}
+
+    def test_mixed_case_csv_key_is_found(self):
+        items_dict, ambiguous_keys = fetch_items_by_csv_keys(
+            'pasons', [self.csv_row('abc100', 'pcs', 'SKU-1')], RULES_FIELDS
+        )
+
+        self.assertEqual(ambiguous_keys, set())
+        self.assertEqual(items_dict[('abc100', 'pcs', 'sku-1')].id, self.item.id)
+
+    def test_other_platform_is_not_matched(self):
+        items_dict, _ = fetch_items_by_csv_keys(
+            'talabat', [self.csv_row('ABC100', 'PCS', 'Sku-1')], RULES_FIELDS
+        )
+
+        self.assertEqual(items_dict, {})
+
+    def test_case_variant_duplicates_are_reported(self):
+        Item.objects.create(
+            platform='pasons', item_code='abc100', description='Case variant',
+            units='pcs', sku='SKU-1', wrap='9900',
+        )
+
+        items_dict, ambiguous_keys = fetch_items_by_csv_keys(
+            'pasons', [self.csv_row('Abc100', 'Pcs', 'sku-1')], RULES_FIELDS
+        )
+
+        self.assertEqual(items_dict, {})
+        self.assertEqual(ambiguous_keys, {('abc100', 'pcs', 'sku-1')})
+
+
+class OpenCsvUploadTests(SimpleTestCase):
+    """open_csv_upload picks an encoding that decodes the whole upload"""
+
+    def read_rows(self, content):
+        stream, encoding = open_csv_upload(SimpleUploadedFile('upload.csv', content))
+        return list(csv.reader(stream)), encoding
+
+    def test_non_utf8_byte_after_64kb_falls_back_to_cp1252(self):
+        ascii_rows = b''.join(b'%d,plain ascii description\n' % i for i in range(3000))
+        self.assertGreater(len(ascii_rows), 64 * 1024)
+
+        rows, encoding = self.read_rows(b'item_code,description\n' + ascii_rows + b'2,Caf\xe9\n')
+
+        self.assertEqual(encoding, 'cp1252')
+        self.assertEqual(rows[-1], ['2', 'Caf\u00e9'])
+
+    def test_utf8_upload_is_decoded_as_utf8(self):
+        rows, encoding = self.read_rows('item_code,description\n1,Caf\u00e9\n'.encode('utf-8'))
+
+        self.assertEqual(encoding, 'utf-8-sig')
+        self.assertEqual(rows[1], ['1', 'Caf\u00e9'])
+
+    def test_leading_bom_and_zero_width_characters_are_stripped(self):
+        content = '\ufeff\u200b\u2060item_code,description\n1,x\n'.encode('utf-8')
+
+        rows, _ = self.read_rows(content)
+
+        self.assertEqual(rows[0], ['item_code', 'description'])
@@ -0,0 +1,40 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from integration.models import Item
+
+
+class DeleteItemsApiAllScopeTests(TestCase):
+    """delete_scope='all' runs the deletes directly and reports an empty scope"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='pass')
+        self.client.force_login(self.user)
+        self.url = reverse('integration:delete_items_api')
+
+    def delete_all(self, platform):
+        return self.client.post(self.url, json.dumps({
+            'delete_scope': 'all', 'platform': platform,
+            'confirm_all': True, 'confirm_text': 'DELETE ALL',
+        }), content_type='application/json').json()
+
+    def test_empty_platform_reports_no_items(self):
+        Item.objects.create(platform='pasons', item_code='KEEP', description='d', units='pcs', sku='s', wrap='10000')
+
+        response = self.delete_all('talabat')
+
+        self.assertFalse(response['success'])
+        self.assertEqual(response['message'], 'No items found for deletion')
+        self.assertTrue(Item.objects.filter(item_code='KEEP').exists())
+
+    def test_platform_items_are_deleted(self):
+        Item.objects.create(platform='talabat', item_code='GONE', description='d', units='pcs', sku='s', wrap='10000')
+
+        response = self.delete_all('talabat')
+
+        self.assertTrue(response['success'])
+        self.assertEqual(response['deleted_count'], 1)
+        self.assertFalse(Item.objects.filter(item_code='GONE').exists())
@@ -0,0 +1,116 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from integration.models import Item, Outlet
+from integration.views import get_active_outlet
+
+
+class ClsLockToggleApiTests(TestCase):
+    """cls_lock_toggle_api resolves item_id the same way as the outlet lock APIs"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='pass')
+        self.client.force_login(self.user)
+        self.url = reverse('integration:cls_lock_toggle_api')
+        self.item = Item.objects.create(
+            platform='pasons', item_code='LOCK1', description='Lock item',
+            units='pcs', sku='LOCK1-SKU', wrap='9900',
+        )
+
+    def test_non_digit_item_id_is_rejected(self):
+        response = self.client.post(self.url, {
+            'item_id': 'abc', 'item_code': 'LOCK1', 'lock_type': 'status', 'value': 'lock',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'success': False, 'message': 'Invalid item_id'})
+        self.item.refresh_from_db()
+        self.assertFalse(self.item.status_locked)
+
+    def test_unknown_item_id_does_not_fall_back_to_item_code(self):
+        response = self.client.post(self.url, {
+            'item_id': str(self.item.pk + 1000), 'item_code': 'LOCK1',
+            'lock_type': 'status', 'value': 'lock',
+        })
+
+        self.assertFalse(response.json()['success'])
+        self.item.refresh_from_db()
+        self.assertFalse(self.item.status_locked)
+
+    def test_item_id_locks_the_named_item(self):
+        response = self.client.post(self.url, {
+            'item_id': str(self.item.pk), 'lock_type': 'price', 'value': 'lock',
+        })
+
+        self.assertTrue(response.json()['price_locked'])
+        self.item.refresh_from_db()
+        self.assertTrue(self.item.price_locked)
+
+
+class SaveProductApiTests(TestCase):
+    """save_product_api writes through Item.save() so the pre_save signals run"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='pass')
+        self.client.force_login(self.user)
+        self.url = reverse('integration:save-product')
+        self.item = Item.objects.create(
+            platform='pasons', item_code='WDF1', description='Packaged item',
+            units='pcs', sku='WDF1-SKU', wrap='10000', cost=Decimal('12.34'),
+        )
+        # Legacy row written before the WDF default existed
+        Item.objects.filter(pk=self.item.pk).update(weight_division_factor=None)
+
+    def test_lock_only_change_keeps_wdf_default(self):
+        response = self.client.post(self.url, {
+            'platform': 'pasons', 'item_code': 'WDF1', 'price_locked': 'true',
+        })
+
+        self.assertTrue(response.json()['success'])
+        self.item.refresh_from_db()
+        self.assertTrue(self.item.price_locked)
+        self.assertEqual(self.item.weight_division_factor, Decimal('1'))
+
+    def test_unchanged_converted_cost_is_not_rewritten(self):
+        self.client.post(self.url, {
+            'platform': 'pasons', 'item_code': 'WDF1', 'cost': '10', 'weight_division_factor': '3',
+        })
+        self.item.refresh_from_db()
+        updated_at = self.item.updated_at
+
+        self.client.post(self.url, {
+            'platform': 'pasons', 'item_code': 'WDF1', 'cost': '10', 'weight_division_factor': '3',
+        })
+
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.converted_cost, Decimal('3.33'))
+        self.assertEqual(self.item.updated_at, updated_at)
+
+
+class OutletCacheInvalidationTests(TestCase):
+    """Saving an Outlet drops the cached entries for its old and new store_id"""
+
+    def setUp(self):
+        cache.clear()
+        self.outlet = Outlet.objects.create(name='O1', location='Here', store_id='111111', platforms='pasons')
+
+    def test_store_id_change_drops_the_old_key(self):
+        self.assertEqual(get_active_outlet('111111').pk, self.outlet.pk)
+
+        self.outlet.store_id = '222222'
+        self.outlet.save()
+
+        self.assertIsNone(get_active_outlet('111111'))
+        self.assertEqual(get_active_outlet('222222').pk, self.outlet.pk)
+
+    def test_deactivation_drops_the_cached_outlet(self):
+        self.assertIsNotNone(get_active_outlet('111111'))
+
+        self.outlet.is_active = False
+        self.outlet.save()
+
+        self.assertIsNone(get_active_outlet('111111'))
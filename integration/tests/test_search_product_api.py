@@ -0,0 +1,43 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from integration.models import Item
+
+
+class SearchProductApiTests(TestCase):
+    """Single-mode search caches matched ids only; item fields are read fresh"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='tester', password='pass')
+        self.client.force_login(self.user)
+        self.url = reverse('integration:search-product')
+        self.item = Item.objects.create(
+            platform='pasons', item_code='C2', description='Cached item', units='pcs',
+            sku='C2-SKU', wrap='10000', selling_price=Decimal('8.00'), price_locked=True,
+        )
+
+    def search(self):
+        return self.client.get(self.url, {'q': 'C2', 'platform': 'pasons'}).json()
+
+    def test_saved_price_and_lock_are_not_served_from_cache(self):
+        self.assertEqual(self.search()['items'][0]['selling_price'], 8.0)
+
+        self.client.post(reverse('integration:save-product'), {
+            'platform': 'pasons', 'item_code': 'C2', 'selling_price': '9.99', 'price_locked': 'false',
+        })
+
+        item_data = self.search()['items'][0]
+        self.assertEqual(item_data['selling_price'], 9.99)
+        self.assertFalse(item_data['price_locked'])
+
+    def test_deleted_item_drops_out_of_cached_results(self):
+        self.assertTrue(self.search()['success'])
+
+        self.item.delete()
+
+        self.assertFalse(self.search()['success'])
@@ -14,11 +14,15 @@
 # - Industry-standard CDC (Change Data Capture) approach
 # - 15-20x performance improvement for 14,000+ row updates
 
+import codecs
+import io
 import logging
 import hashlib
 from decimal import Decimal, ROUND_HALF_UP, ROUND_CEILING, ROUND_FLOOR
 from typing import Dict, Tuple, Optional, Union
 
+from django.db.models import BooleanField, Case, F, Value, When
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -563,27 +567,70 @@ class DataValidator:
         return {'is_valid': True, 'errors': [], 'warnings': []}
 
 
-def decode_csv_upload(uploaded_file):
+# Invisible characters some editors/exporters put before the first header
+CSV_LEADING_INVISIBLE_CHARS = '\ufeff\ufffe\u200b\u200c\u200d\u2060'
+
+
+def _csv_upload_decodes_as(raw, encoding, chunk_size=1024 * 1024):
     """
-    Decode an uploaded CSV file with sensible encoding fallbacks.
-    Tries 'utf-8', 'utf-8-sig', 'cp1252' (Windows), then 'latin-1'.
-    Also strips BOM and invisible characters from the beginning.
-    Returns (text, encoding_used).
+    Strictly decode the whole upload in chunks (never holding it all in memory).
+    Returns True when every byte is valid in the given encoding.
     """
-    raw = uploaded_file.read()
-    for enc in ('utf-8', 'utf-8-sig', 'cp1252', 'latin-1'):
-        try:
-            text = raw.decode(enc)
-            # Strip BOM and other invisible characters from the start
-            # \ufeff is the BOM character, also strip zero-width chars
-            text = text.lstrip('\ufeff\ufffe\u200b\u200c\u200d\u2060')
-            return text, enc
-        except UnicodeDecodeError:
-            continue
-    # Last resort: replace invalid bytes in utf-8
-    text = raw.decode('utf-8', errors='replace')
-    text = text.lstrip('\ufeff\ufffe\u200b\u200c\u200d\u2060')
-    return text, 'utf-8 (errors=replace)'
+    decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+    raw.seek(0)
+    try:
+        while True:
+            chunk = raw.read(chunk_size)
+            if not chunk:
+                decoder.decode(b'', final=True)
+                return True
+            decoder.decode(chunk)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        raw.seek(0)
+
+
+def open_csv_upload(uploaded_file):
+    """
+    Open an uploaded CSV as a streaming text file instead of decoding it all at once.
+    Tries 'utf-8-sig' (UTF-8, strips a leading BOM), 'cp1252' (Windows), then
+    'latin-1'. Each candidate is checked against the whole file, so a non-UTF-8
+    byte anywhere in the upload falls back to the next encoding instead of being
+    replaced. Leading BOM/zero-width characters are skipped as decode_csv_upload() did.
+    Returns (text_stream, encoding_used).
+    """
+    raw = getattr(uploaded_file, 'file', uploaded_file)
+    encoding = 'latin-1'  # Decodes any byte sequence
+    for enc in ('utf-8-sig', 'cp1252'):
+        if _csv_upload_decodes_as(raw, enc):
+            encoding = enc
+            break
+    stream = io.TextIOWrapper(raw, encoding=encoding, errors='strict', newline='')
+    # Skip invisible characters before the header row
+    while True:
+        pos = stream.tell()
+        ch = stream.read(1)
+        if not ch or ch not in CSV_LEADING_INVISIBLE_CHARS:
+            stream.seek(pos)
+            break
+    return stream, encoding
+
+
+def iter_csv_batches(rows, batch_size=10000):
+    """
+    Group an iterable of parsed CSV rows into lists of at most batch_size rows.
+    Lets callers fetch, compare and write one bounded batch at a time instead of
+    holding the whole upload (and every matching model instance) in memory.
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
 def normalize_csv_header(header):
@@ -715,6 +762,80 @@ def get_stock_info(item):
     }
 
 
+# =============================================================================
+# OUTLET LOOKUP CACHE - shared by views.get_active_outlet() and signals.py
+# =============================================================================
+
+def outlet_cache_key(store_id):
+    """Cache key for views.get_active_outlet()."""
+    return f"outlet_by_store:{hashlib.md5(str(store_id).encode('utf-8')).hexdigest()}"
+
+
+# =============================================================================
+# OUTLET ENABLED STATUS - STOCK vs MINIMUM QTY RULES
+# Shared by views and the Item CLS cascade in models.py
+# =============================================================================
+
+def outlet_enabled_status(outlet_stock, min_qty):
+    """
+    Scalar core of views.calculate_outlet_enabled_status().
+    
+    Takes plain values instead of the Item so callers that already hold
+    minimum_qty (e.g. from values()/only() rows) never touch a model instance.
+    
+    Args:
+        outlet_stock: Converted outlet stock (None counts as 0)
+        min_qty: Item minimum_qty (None/0 = no minimum)
+    
+    Returns:
+        bool: True = Enabled, False = Disabled
+    """
+    stock = outlet_stock or 0
+    
+    # Rule 1: No stock or negative stock = Always Disabled
+    if stock <= 0:
+        return False
+    
+    # Rule 2: outlet_stock is ALREADY converted (no further division needed)
+    # wrap=9900: already multiplied by WDF during stock update
+    # wrap=10000: already divided by OCQ during stock update
+    
+    # Rule 3: Check if stock is GREATER THAN minimum_qty requirement
+    if min_qty is not None and min_qty > 0:
+        if stock <= min_qty:  # Must be GREATER than (not equal)
+            return False
+    
+    # All checks passed = Enabled
+    return True
+
+
+def outlet_enabled_status_expression(item=None):
+    """
+    ORM equivalent of outlet_enabled_status() for ItemOutlet querysets.
+    
+    Annotate with calculated_enabled=outlet_enabled_status_expression() so list
+    endpoints get the Enabled/Disabled flag from the database instead of
+    branching in Python per row. Rules must stay in sync with outlet_enabled_status().
+    
+    Pass ``item`` when all rows belong to one known item: its minimum_qty is then
+    inlined instead of joined, so the expression can also be used in update().
+    """
+    if item is None:
+        min_qty_rule = When(
+            item__minimum_qty__gt=0,
+            outlet_stock__lte=F('item__minimum_qty'),
+            then=Value(False)
+        )
+    elif item.minimum_qty is not None and item.minimum_qty > 0:
+        min_qty_rule = When(outlet_stock__lte=item.minimum_qty, then=Value(False))
+    else:
+        min_qty_rule = None
+    rules = [When(outlet_stock__lte=0, then=Value(False))]
+    if min_qty_rule is not None:
+        rules.append(min_qty_rule)
+    return Case(*rules, default=Value(True), output_field=BooleanField())
+
+
 # =============================================================================
 # HASH-BASED CHANGE DETECTION FOR CSV BULK UPDATES
 # Industry-standard CDC (Change Data Capture) approach
@@ -1,29 +1,114 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse
 from django.contrib import messages
 from django.core.cache import cache
 from django.views.decorators.http import require_http_methods
-from django.db import OperationalError
+from django.db import OperationalError, router, transaction
 from .models import Outlet, Item, ItemOutlet
-from .utils import decode_csv_upload, validate_wdf_for_division, validate_ocq_for_division
+from .utils import (
+    VALID_PLATFORMS, open_csv_upload, iter_csv_batches, normalize_csv_header,
+    validate_wdf_for_division, validate_ocq_for_division,
+    outlet_enabled_status, outlet_enabled_status_expression, outlet_cache_key,
+)
 from .promotion_service import PromotionService
-from .db_utils import retry_on_db_lock
+from .db_utils import retry_on_db_lock, fast_bulk_update_rows
 from .batch_manager import BatchTransactionManager
 import logging
 from decimal import Decimal, InvalidOperation
-from django.db.models import Q, Sum
+from django.db.models import Q, Sum, Count, F, Value, Exists, OuterRef
+from django.db.models.functions import Lower
 from django.core.paginator import Paginator
 from functools import wraps
 from datetime import datetime, timedelta, date
+import csv
+import itertools
 import json
+import re
+import hashlib
 
 logger = logging.getLogger(__name__)
 
 # Allowed wrap values for items
 ALLOWED_WRAP_VALUES = {"9900", "10000"}
 
+# Precompiled numeric patterns for CSV validation (avoids exception-driven parsing)
+DECIMAL_PATTERN = re.compile(r'^[+-]?(?:\d+(?:\.\d*)?|\.\d+)$')
+INTEGER_PATTERN = re.compile(r'^[+-]?\d+$')
+
+# search_product_api bulk-mode numeric filters: GET param -> (ORM lookup, coercion)
+SEARCH_NUMERIC_FILTERS = (
+    ('price_min', 'selling_price__gte', float),
+    ('price_max', 'selling_price__lte', float),
+    ('stock_min', 'stock__gte', int),
+    ('stock_max', 'stock__lte', int),
+)
+
+# Boolean-ish form values for CLS/BLS lock flags
+TRUTHY_VALUES = frozenset({'on', 'true', '1', 'yes', 'locked', 'lock'})
+LOCK_VALUES = frozenset({'true', 'lock', 'locked', '1'})
+UNLOCK_VALUES = frozenset({'false', 'unlock', 'unlocked', '0'})
+
+# Bulk item creation CSV columns (bulk_item_creation and preview_csv_api)
+BULK_CREATION_REQUIRED_HEADERS = frozenset({'wrap', 'item_code', 'description', 'units', 'sku', 'pack_description'})
+BULK_CREATION_OPTIONAL_HEADERS = frozenset({
+    'barcode', 'mrp', 'selling_price', 'cost', 'stock', 'weight_division_factor',
+    'outer_case_quantity', 'minimum_qty', 'talabat_margin'
+})
+BULK_CREATION_ALLOWED_HEADERS = BULK_CREATION_REQUIRED_HEADERS | BULK_CREATION_OPTIONAL_HEADERS
+
+# Product update CSV columns (preview_csv_api)
+PRODUCT_UPDATE_REQUIRED_HEADERS = frozenset({'item_code', 'units'})
+PRODUCT_UPDATE_OPTIONAL_HEADERS = frozenset({'mrp', 'cost', 'stock'})
+PRODUCT_UPDATE_ALLOWED_HEADERS = PRODUCT_UPDATE_REQUIRED_HEADERS | PRODUCT_UPDATE_OPTIONAL_HEADERS
+
+# Stock conversion rules CSV columns (rules_update_stock and its preview)
+RULES_STOCK_REQUIRED_HEADERS = frozenset({'item_code', 'units', 'sku'})
+RULES_STOCK_ALLOWED_HEADERS = RULES_STOCK_REQUIRED_HEADERS | {
+    'weight_division_factor', 'outer_case_quantity', 'minimum_qty'
+}
+AMBIGUOUS_CSV_KEY_ERROR = (
+    'Multiple items match this item_code/units/sku when ignoring case - '
+    'row skipped, fix the duplicate items first'
+)
+
+# item_outlets_api caches (platform, item_code, sku/units) -> Item id; the item row
+# itself is always re-read by primary key
+ITEM_LOOKUP_CACHE_TIMEOUT = 300
+
+# Outlet-by-store_id lookups for the outlet APIs (invalidated on Outlet save/delete,
+# but only in the saving process unless CACHES points at a shared backend)
+OUTLET_CACHE_TIMEOUT = 60
+
+# Locked products report lock types: lock_type -> (lock flag field, display label, export file label)
+LOCKED_PRODUCT_LOCK_TYPES = {
+    'cls_price': ('price_locked', 'CLS Price Lock', 'CLS-Price-Locked'),
+    'cls_status': ('status_locked', 'CLS Status Lock', 'CLS-Status-Locked'),
+    'bls_price': ('price_locked', 'BLS Price Lock', 'BLS-Price-Locked'),
+    'bls_status': ('status_locked', 'BLS Status Lock', 'BLS-Status-Locked'),
+}
+
+# Uploads larger than this are rejected before any decoding work
+MAX_CSV_UPLOAD_BYTES = 50 * 1024 * 1024
+
+# search_product_api single-mode query -> matched Item ids are cached briefly (autocomplete
+# repeats queries); the item rows themselves are always re-read
+SEARCH_CACHE_TIMEOUT = 60
+
+# Pre-serialized bodies for static JSON errors on the hot API paths (same bytes
+# JsonResponse would produce). Responses themselves are never shared: middleware
+# mutates headers/cookies, so static_json_response() wraps them per request.
+POST_ONLY_ERROR = json.dumps({'success': False, 'message': 'Only POST method allowed'}).encode()
+OUTLET_NOT_FOUND_ERROR = json.dumps({'success': False, 'message': 'Outlet not found or inactive'}).encode()
+ITEM_NOT_FOUND_ERROR = json.dumps({'success': False, 'message': 'Item not found or inactive'}).encode()
+INVALID_LOCK_TYPE_ERROR = json.dumps({'success': False, 'message': 'Invalid lock_type; use status or price'}).encode()
+
+
+def static_json_response(body):
+    """Return a fresh JSON response around one of the pre-serialized bodies above."""
+    return HttpResponse(body, content_type='application/json')
+
 
 def rate_limit(max_requests: int, time_window_seconds: int):
     """
@@ -159,23 +244,19 @@ def dashboard(request):
         pasons_total_items = Item.objects.filter(platform='pasons', is_active=True).count()
         
         # Count items that have at least one ItemOutlet with stock > 0
+        # and items with outlets but zero/low stock, in one aggregate query.
         # This is a simple approximation - active = has stock
-        items_with_stock = ItemOutlet.objects.filter(
-            outlet__platforms='pasons',
-            item__platform='pasons',
-            outlet__is_active=True,
-            outlet_stock__gt=0
-        ).values('item_id').distinct().count()
-        
-        # Items with outlets but zero/low stock
-        items_with_outlets = ItemOutlet.objects.filter(
+        link_counts = ItemOutlet.objects.filter(
             outlet__platforms='pasons',
             item__platform='pasons',
             outlet__is_active=True
-        ).values('item_id').distinct().count()
+        ).aggregate(
+            items_with_stock=Count('item_id', distinct=True, filter=Q(outlet_stock__gt=0)),
+            items_with_outlets=Count('item_id', distinct=True),
+        )
         
-        pasons_active_items = items_with_stock
-        pasons_low_stock_items = max(0, items_with_outlets - items_with_stock)
+        pasons_active_items = link_counts['items_with_stock']
+        pasons_low_stock_items = max(0, link_counts['items_with_outlets'] - link_counts['items_with_stock'])
         
     except Exception as e:
         import sys
@@ -207,22 +288,18 @@ def talabat_dashboard(request):
         talabat_total_items = Item.objects.filter(platform='talabat', is_active=True).count()
         
         # Count items that have at least one ItemOutlet with stock > 0
-        items_with_stock = ItemOutlet.objects.filter(
-            outlet__platforms='talabat',
-            item__platform='talabat',
-            outlet__is_active=True,
-            outlet_stock__gt=0
-        ).values('item_id').distinct().count()
-        
-        # Items with outlets but zero/low stock
-        items_with_outlets = ItemOutlet.objects.filter(
+        # and items with outlets but zero/low stock, in one aggregate query
+        link_counts = ItemOutlet.objects.filter(
             outlet__platforms='talabat',
             item__platform='talabat',
             outlet__is_active=True
-        ).values('item_id').distinct().count()
+        ).aggregate(
+            items_with_stock=Count('item_id', distinct=True, filter=Q(outlet_stock__gt=0)),
+            items_with_outlets=Count('item_id', distinct=True),
+        )
         
-        talabat_active_items = items_with_stock
-        talabat_low_stock_items = max(0, items_with_outlets - items_with_stock)
+        talabat_active_items = link_counts['items_with_stock']
+        talabat_low_stock_items = max(0, link_counts['items_with_outlets'] - link_counts['items_with_stock'])
         
     except Exception as e:
         import sys
@@ -279,7 +356,7 @@ def list_items_api(request):
     """
     try:
         platform = request.GET.get('platform', '').strip()
-        if platform not in ('pasons', 'talabat'):
+        if platform not in VALID_PLATFORMS:
             return JsonResponse({'success': False, 'message': 'Invalid or missing platform'}, status=400)
 
         query = request.GET.get('q', '').strip()
@@ -611,15 +688,13 @@ def bulk_item_creation(request):
                 
                 # Process CSV file
                 import csv
-                import io
 
                 # Read CSV content with encoding fallback
-                csv_content, _encoding_used = decode_csv_upload(csv_file)
-                csv_reader = csv.DictReader(io.StringIO(csv_content))
+                csv_stream, _encoding_used = open_csv_upload(csv_file)
+                csv_reader = csv.DictReader(csv_stream)
                 # Strict header validation
-                required_headers = {'wrap', 'item_code', 'description', 'units', 'sku', 'pack_description'}
-                optional_headers = {'barcode', 'mrp', 'selling_price', 'cost', 'stock', 'weight_division_factor', 'outer_case_quantity', 'minimum_qty', 'talabat_margin'}
-                allowed_headers = required_headers | optional_headers
+                required_headers = BULK_CREATION_REQUIRED_HEADERS
+                allowed_headers = BULK_CREATION_ALLOWED_HEADERS
                 # Filter out empty header fields (from trailing delimiters)
                 # Use normalize_csv_header for proper BOM/invisible char handling
                 from .utils import normalize_csv_header
@@ -631,7 +706,7 @@ def bulk_item_creation(request):
                 if 'is_active' in headers:
                     messages.error(request, "Column 'is_active' is not allowed in bulk creation CSV. Please remove it.")
                     return redirect('integration:bulk_item_creation')
-                missing_required = sorted(list(required_headers - set(headers)))
+                missing_required = sorted(required_headers.difference(headers))
                 unknown_headers = sorted([h for h in headers if h and h not in allowed_headers])
                 if missing_required:
                     messages.error(request, f"Missing required columns: {', '.join(missing_required)}. The file was rejected.")
@@ -817,10 +892,15 @@ def bulk_item_creation(request):
                 
                 # If any errors were detected, reject entire file without creating
                 if errors:
-                    for error in errors[:5]:  # Show first 5 errors
-                        messages.error(request, error)
+                    # Single summary message (rejection notice + first 5 errors) - one
+                    # message store write
+                    error_summary = ' | '.join(
+                        ['CSV validation failed; the file was rejected. Fix the reported issues and try again.']
+                        + errors[:5]
+                    )
                     if len(errors) > 5:
-                        messages.warning(request, f"And {len(errors) - 5} more errors...")
+                        error_summary += f" | And {len(errors) - 5} more errors..."
+                    messages.error(request, error_summary)
                     # Persist a structured breakdown to show on page
                     try:
                         request.session['bulk_creation_summary'] = {
@@ -838,7 +918,6 @@ def bulk_item_creation(request):
                         }
                     except Exception:
                         pass
-                    messages.error(request, 'CSV validation failed; the file was rejected. Fix the reported issues and try again.')
                     return redirect('integration:bulk_item_creation')
 
                 # Create items in bulk for THIS platform
@@ -1009,7 +1088,7 @@ def get_outlets_by_platform(request):
     if platform == 'all':
         # Return all active outlets when 'all' is selected
         outlets = Outlet.objects.filter(is_active=True).order_by('name')
-    elif platform in ['pasons', 'talabat']:
+    elif platform in VALID_PLATFORMS:
         # STRICT platform isolation - no 'both'
         outlets = Outlet.objects.filter(
             is_active=True,
@@ -1080,7 +1159,7 @@ def product_update(request):
         csv_file = request.FILES.get('csv_file')
         
         # Validate required fields
-        if not platform or platform not in ('pasons', 'talabat'):
+        if not platform or platform not in VALID_PLATFORMS:
             messages.error(request, "Please select a valid platform (Pasons or Talabat).")
             return redirect('integration:product_update')
         
@@ -1108,11 +1187,10 @@ def product_update(request):
                 return redirect('integration:product_update')
             
             import csv
-            import io
             from django.db.models import Q
             
-            csv_content, _encoding_used = decode_csv_upload(csv_file)
-            csv_reader = csv.DictReader(io.StringIO(csv_content))
+            csv_stream, _encoding_used = open_csv_upload(csv_file)
+            csv_reader = csv.DictReader(csv_stream)
             
             if not csv_reader.fieldnames:
                 messages.error(request, "CSV file has no headers")
@@ -1263,6 +1341,18 @@ def product_update(request):
             BATCH_SIZE = 1000
             batch_manager = BatchTransactionManager(batch_size=BATCH_SIZE)
             
+            # Union of outlet fields touched by this upload - MRP, cost and stock
+            # changes for a row are written together in one bulk_update per batch
+            outlet_update_fields = []
+            if 'mrp' in present_value_headers:
+                outlet_update_fields.extend(['outlet_mrp', 'outlet_selling_price'])
+            if 'cost' in present_value_headers:
+                outlet_update_fields.append('outlet_cost')
+            if 'stock' in present_value_headers:
+                outlet_update_fields.append('outlet_stock')
+                # Also update is_active_in_outlet for status lock enforcement
+                outlet_update_fields.append('is_active_in_outlet')
+            
             logger.info(f"Processing {len(csv_rows)} rows in batches of {BATCH_SIZE}")
             
             # Process rows in batches
@@ -1504,17 +1594,6 @@ def product_update(request):
                         
                         # Update ItemOutlet models
                         if outlets_to_update:
-                            # Only update outlet fields based on what was in the CSV
-                            outlet_update_fields = []
-                            if 'mrp' in present_value_headers:
-                                outlet_update_fields.extend(['outlet_mrp', 'outlet_selling_price'])
-                            if 'cost' in present_value_headers:
-                                outlet_update_fields.append('outlet_cost')
-                            if 'stock' in present_value_headers:
-                                outlet_update_fields.append('outlet_stock')
-                                # Also update is_active_in_outlet for status lock enforcement
-                                outlet_update_fields.append('is_active_in_outlet')
-                            
                             if outlet_update_fields:
                                 ItemOutlet.objects.bulk_update(outlets_to_update, outlet_update_fields, batch_size=2000)
                             outlets_to_update = []  # Clear for next batch
@@ -1529,35 +1608,43 @@ def product_update(request):
                     logger.error(f"Batch {batch_start//BATCH_SIZE + 1} failed after retries: {str(e)}")
                     errors.append(f"Batch {batch_start//BATCH_SIZE + 1} failed: {str(e)}")
             
-            # Success messages with actual business operation statistics
+            # Outcome summary: every part is folded into ONE message (one message store
+            # write) tagged with the most severe level present
+            outcome_parts = []
+            outcome_levels = []
             if actual_database_changes > 0 or csv_rows_with_protection > 0:
                 if csv_rows_with_protection > 0:
                     # Include protection statistics in message
                     if actual_database_changes > 0:
-                        messages.success(request, f"Updated {actual_database_changes} items at {outlet.name} ({platform.title()}), protected {csv_rows_with_protection} promotion items from price updates.")
+                        outcome_parts.append(f"Updated {actual_database_changes} items at {outlet.name} ({platform.title()}), protected {csv_rows_with_protection} promotion items from price updates.")
                     else:
-                        messages.success(request, f"Protected {csv_rows_with_protection} promotion items from price updates at {outlet.name} ({platform.title()}).")
+                        outcome_parts.append(f"Protected {csv_rows_with_protection} promotion items from price updates at {outlet.name} ({platform.title()}).")
                     
-                    # Additional info message for Talabat protection
+                    # Additional note for Talabat protection
                     if platform.lower() == 'talabat':
-                        messages.info(request, f"Talabat promotion prices preserved - MRP updated but selling prices protected for {csv_rows_with_protection} CSV rows.")
+                        outcome_parts.append(f"Talabat promotion prices preserved - MRP updated but selling prices protected for {csv_rows_with_protection} CSV rows.")
                 else:
                     # Normal message when no protection occurred
-                    messages.success(request, f"Updated {actual_database_changes} items at {outlet.name} ({platform.title()}).")
+                    outcome_parts.append(f"Updated {actual_database_changes} items at {outlet.name} ({platform.title()}).")
+                outcome_levels.append(messages.SUCCESS)
             
             csv_rows_no_change = csv_rows_processed - csv_rows_with_changes - len(not_found_items) - len(errors)
             if csv_rows_no_change > 0:
-                messages.info(request, f"{csv_rows_no_change} CSV rows already up-to-date.")
+                outcome_parts.append(f"{csv_rows_no_change} CSV rows already up-to-date.")
+                outcome_levels.append(messages.INFO)
             if not_found_items:
                 if len(not_found_items) <= 5:
-                    messages.warning(request, f"Items not found: {', '.join(not_found_items)}")
+                    outcome_parts.append(f"Items not found: {', '.join(not_found_items)}")
                 else:
-                    messages.warning(request, f"{len(not_found_items)} items not found.")
+                    outcome_parts.append(f"{len(not_found_items)} items not found.")
+                outcome_levels.append(messages.WARNING)
             if errors:
-                for error in errors[:3]:
-                    messages.error(request, error)
+                outcome_parts.extend(errors[:3])
                 if len(errors) > 3:
-                    messages.warning(request, f"And {len(errors) - 3} more errors...")
+                    outcome_parts.append(f"And {len(errors) - 3} more errors...")
+                outcome_levels.append(messages.ERROR)
+            if outcome_parts:
+                messages.add_message(request, max(outcome_levels), ' | '.join(outcome_parts))
             
             # Log upload history with simplified statistics
             if csv_rows_with_protection > 0:
@@ -1611,7 +1698,6 @@ def rules_update_price(request):
     from django.contrib import messages
     from decimal import Decimal, InvalidOperation
     import csv
-    import io
     
     if request.method == 'POST':
         platform = request.POST.get('platform')
@@ -1623,8 +1709,8 @@ def rules_update_price(request):
         
         if platform and csv_file:
             try:
-                csv_content, _ = decode_csv_upload(csv_file)
-                csv_reader = csv.DictReader(io.StringIO(csv_content))
+                csv_stream, _ = open_csv_upload(csv_file)
+                csv_reader = csv.DictReader(csv_stream)
                 
                 if not csv_reader.fieldnames:
                     messages.error(request, "CSV file has no headers")
@@ -1639,20 +1725,26 @@ def rules_update_price(request):
                     messages.error(request, f"Missing columns: {', '.join(sorted(missing))}")
                     return redirect('integration:rules_update_price')
                 
+                # Normalize headers once so rows come back keyed by clean names
+                csv_reader.fieldnames = [normalize_csv_header(h) for h in csv_reader.fieldnames]
+                
                 # Parse CSV rows (fast - no DB)
                 csv_rows = []
                 errors = []
-                for row_num, original_row in enumerate(csv_reader, start=2):
-                    row = {k.strip().lower(): v.strip() if v else '' for k, v in original_row.items()}
-                    item_code = row.get('item_code', '')
-                    units = row.get('units', '')
-                    sku = row.get('sku', '')
-                    margin_str = row.get('margin', '')
+                for row_num, row in enumerate(csv_reader, start=2):
+                    item_code = (row.get('item_code') or '').strip()
+                    units = (row.get('units') or '').strip()
+                    sku = (row.get('sku') or '').strip()
+                    margin_str = (row.get('margin') or '').strip()
                     
                     if not item_code or not units or not sku or not margin_str:
                         errors.append(f"Row {row_num}: Missing required field")
                         continue
                     
+                    if not DECIMAL_PATTERN.match(margin_str):
+                        errors.append(f"Row {row_num}: Invalid margin")
+                        continue
+                    
                     try:
                         margin = Decimal(margin_str)
                         if margin < 0 or margin > 100:
@@ -1678,8 +1770,14 @@ def rules_update_price(request):
                     'id', 'item_code', 'units', 'sku', 'talabat_margin'
                 )
                 
-                # Build lookup dict
-                items_dict = {(i.item_code, i.units, i.sku): i for i in items_qs}
+                # Build lookup dict - stream in chunks and keep only CSV keys
+                # so memory stays flat regardless of catalogue size
+                csv_keys = {(r['item_code'], r['units'], r['sku']) for r in csv_rows}
+                items_dict = {}
+                for i in items_qs.iterator(chunk_size=2000):
+                    key = (i.item_code, i.units, i.sku)
+                    if key in csv_keys:
+                        items_dict[key] = i
                 
                 # Process - FAST: just update margin directly
                 items_to_update = []
@@ -1717,7 +1815,7 @@ def rules_update_price(request):
                     
                     # Recalculate selling prices
                     outlets_to_update = []
-                    for item_outlet in item_outlets:
+                    for item_outlet in item_outlets.iterator(chunk_size=2000):
                         if item_outlet.outlet_mrp and item_outlet.outlet_mrp > 0:
                             # Calculate base price - pass wrap type to avoid item_code ambiguity
                             base_price = PricingCalculator.calculate_base_price(
@@ -1777,6 +1875,66 @@ def rules_update_price(request):
     return render(request, 'rules_update_price.html', context)
 
 
+def fetch_items_by_csv_keys(platform, csv_rows, fields, chunk_size=500):
+    """
+    Fetch only the Items referenced by parsed CSV rows instead of the whole platform.
+    
+    Queries by lowercased item_code in chunks (served by item_code_units_ci_idx)
+    and keeps rows whose (item_code, units, sku) matches a CSV row
+    case-insensitively. Rows come back as named tuples from values_list(), so no
+    Item instances are built; ``fields`` must include item_code, units and sku.
+    
+    Keys matched by more than one item (codes differing only by case) are left
+    out of the result and returned separately so callers can report them.
+    
+    Returns:
+        tuple: (items_dict, ambiguous_keys) where items_dict maps the lowercased
+        (item_code, units, sku) -> named tuple of ``fields``
+    """
+    wanted_keys = {
+        (r['item_code'].lower(), r['units'].lower(), r['sku'].lower()) for r in csv_rows
+    }
+    item_codes = list({key[0] for key in wanted_keys})
+    items_dict = {}
+    ambiguous_keys = set()
+    for i in range(0, len(item_codes), chunk_size):
+        items_qs = Item.objects.filter(
+            platform=platform,
+            item_code__lower__in=item_codes[i:i + chunk_size]
+        ).order_by().values_list(*fields, named=True)
+        for item in items_qs:
+            key = (item.item_code.lower(), item.units.lower(), item.sku.lower())
+            if key not in wanted_keys:
+                continue
+            if key in items_dict:
+                ambiguous_keys.add(key)
+            items_dict[key] = item
+    for key in ambiguous_keys:
+        del items_dict[key]
+    return items_dict, ambiguous_keys
+
+
+def csv_value_or_current(raw_value, current, parse):
+    """
+    Resolve a raw CSV cell against the value already stored on the item.
+    
+    Blank cells (None) keep the current value. When the cell's text equals the
+    current value's text the current value is returned without parsing, so the
+    common "no change" row never builds a Decimal/int.
+    
+    Args:
+        raw_value: Stripped CSV text, or None when not provided
+        current: Current field value on the item
+        parse: Callable converting the text (e.g. Decimal, int)
+    
+    Returns:
+        The current value or the parsed CSV value
+    """
+    if raw_value is None or raw_value == str(current):
+        return current
+    return parse(raw_value)
+
+
 @login_required
 def rules_update_stock_preview(request):
     """
@@ -1796,10 +1954,9 @@ def rules_update_stock_preview(request):
         from .models import Item
         from decimal import Decimal, InvalidOperation
         import csv
-        import io
         
-        csv_content, _encoding_used = decode_csv_upload(csv_file)
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
+        csv_stream, _encoding_used = open_csv_upload(csv_file)
+        csv_reader = csv.DictReader(csv_stream)
         
         if not csv_reader.fieldnames:
             return JsonResponse({'success': False, 'message': 'CSV has no headers'})
@@ -1807,13 +1964,16 @@ def rules_update_stock_preview(request):
         from .utils import normalize_csv_header
         headers = [normalize_csv_header(h) for h in csv_reader.fieldnames if h and h.strip()]
         
-        # Header validation
-        allowed_headers = {'item_code', 'units', 'sku', 'weight_division_factor', 'outer_case_quantity', 'minimum_qty'}
-        required_headers = {'item_code', 'units', 'sku'}
-        
-        missing_headers = required_headers - set(headers)
+        # Header validation (one set; duplicated known columns would be silently
+        # overwritten by DictReader, so they are rejected)
+        header_set = frozenset(headers)
+        missing_headers = RULES_STOCK_REQUIRED_HEADERS - header_set
         if missing_headers:
             return JsonResponse({'success': False, 'message': f"Missing columns: {', '.join(sorted(missing_headers))}"})
+        if len(header_set) != len(headers):
+            duplicate_headers = sorted(h for h in RULES_STOCK_ALLOWED_HEADERS if headers.count(h) > 1)
+            if duplicate_headers:
+                return JsonResponse({'success': False, 'message': f"Duplicate columns: {', '.join(duplicate_headers)}"})
         
         # Parse all CSV rows first (fast - no DB queries)
         csv_rows = []
@@ -1842,18 +2002,19 @@ def rules_update_stock_preview(request):
         if total_rows == 0:
             return JsonResponse({'success': True, 'platform': platform, 'total_rows': 0, 'items_with_changes': [], 'total_changes': 0, 'errors': errors})
         
-        # BULK FETCH: Single query to get all items
-        items_qs = Item.objects.filter(platform=platform).only(
+        # BULK FETCH: Only the items referenced by the CSV, keyed by lowercased
+        # (item_code, units, sku)
+        items_dict, ambiguous_keys = fetch_items_by_csv_keys(platform, csv_rows, (
             'id', 'item_code', 'units', 'sku', 'weight_division_factor', 'outer_case_quantity', 'minimum_qty'
-        )
-        
-        # Build lookup dict (item_code, units, sku) -> item
-        items_dict = {(i.item_code, i.units, i.sku): i for i in items_qs}
+        ))
         
         # Compare CSV vs DB (fast - in memory)
         items_with_changes = []
         for row_data in csv_rows:
-            key = (row_data['item_code'], row_data['units'], row_data['sku'])
+            key = (row_data['item_code'].lower(), row_data['units'].lower(), row_data['sku'].lower())
+            if key in ambiguous_keys:
+                errors.append(f"Row {row_data['row_num']}: {AMBIGUOUS_CSV_KEY_ERROR}")
+                continue
             item = items_dict.get(key)
             
             if not item:
@@ -1920,140 +2081,182 @@ def rules_update_stock_preview(request):
 def rules_update_stock(request):
     """
     OPTIMIZED Stock conversion rules update - updates weight_division_factor, outer_case_quantity, minimum_qty
-    Uses bulk fetch and bulk_update for fast performance. No change detection - just update values directly.
+    Uses bulk fetch and bulk_update for fast performance. Rows whose values already match are skipped.
     """
     if request.method == 'POST':
         platform = request.POST.get('platform')
         csv_file = request.FILES.get('csv_file')
         
+        # Fail fast: reject bad platform / oversized upload before decoding anything
+        if platform and platform not in VALID_PLATFORMS:
+            from django.contrib import messages
+            messages.error(request, "Invalid platform selected.")
+            return redirect('integration:rules_update_stock')
+        if csv_file and csv_file.size > MAX_CSV_UPLOAD_BYTES:
+            from django.contrib import messages
+            messages.error(request, f"CSV file is too large (max {MAX_CSV_UPLOAD_BYTES // (1024 * 1024)} MB).")
+            return redirect('integration:rules_update_stock')
+        
         if platform and csv_file:
             try:
                 from .models import Item
+                from .utils import iter_csv_batches
                 from django.contrib import messages
-                from decimal import Decimal, InvalidOperation
+                from django.db import transaction
+                from decimal import Decimal
                 import csv
-                import io
                 
-                csv_content, _encoding_used = decode_csv_upload(csv_file)
-                csv_reader = csv.DictReader(io.StringIO(csv_content))
+                # Stream-decode the upload rather than buffering the whole file as a str
+                csv_stream, _encoding_used = open_csv_upload(csv_file)
+                csv_reader = csv.reader(csv_stream)
+                raw_headers = next(csv_reader, None)
                 
-                if not csv_reader.fieldnames:
+                if not raw_headers:
                     messages.error(request, "CSV file has no headers")
                     return redirect('integration:rules_update_stock')
                 
                 from .utils import normalize_csv_header
-                headers = [normalize_csv_header(h) for h in csv_reader.fieldnames if h and h.strip()]
+                headers = [normalize_csv_header(h) for h in raw_headers]
                 
-                # Header validation
-                allowed_headers = {'item_code', 'units', 'sku', 'weight_division_factor', 'outer_case_quantity', 'minimum_qty'}
-                required_headers = {'item_code', 'units', 'sku'}
-                
-                missing_headers = required_headers - set(headers)
+                # Header validation (one set; a duplicated known column is ambiguous,
+                # so it is rejected rather than silently using one of the copies)
+                header_set = frozenset(headers)
+                missing_headers = RULES_STOCK_REQUIRED_HEADERS - header_set
                 if missing_headers:
                     messages.error(request, f"Missing required columns: {', '.join(sorted(missing_headers))}")
                     return redirect('integration:rules_update_stock')
+                if len(header_set) != len(headers):
+                    duplicate_headers = sorted(h for h in RULES_STOCK_ALLOWED_HEADERS if headers.count(h) > 1)
+                    if duplicate_headers:
+                        messages.error(request, f"Duplicate columns: {', '.join(duplicate_headers)}")
+                        return redirect('integration:rules_update_stock')
                 
-                # Parse all CSV rows (fast - no DB)
-                csv_rows = []
-                errors = []
-                for row_num, original_row in enumerate(csv_reader, start=2):
-                    row = {k.strip().lower(): v.strip() if v else '' for k, v in original_row.items()}
-                    item_code = row.get('item_code', '')
-                    units = row.get('units', '')
-                    sku = row.get('sku', '')
-                    
-                    if not item_code or not units or not sku:
-                        errors.append(f"Row {row_num}: Missing required fields")
-                        continue
-                    
-                    csv_rows.append({
-                        'row_num': row_num,
-                        'item_code': item_code,
-                        'units': units,
-                        'sku': sku,
-                        'wdf': row.get('weight_division_factor', ''),
-                        'ocq': row.get('outer_case_quantity', ''),
-                        'minqty': row.get('minimum_qty', '')
-                    })
-                
-                if not csv_rows:
-                    messages.warning(request, "No valid rows found in CSV")
-                    return redirect('integration:rules_update_stock')
+                # Resolve column positions once; rows are read positionally below
+                header_width = len(headers)
+                idx_item_code = headers.index('item_code')
+                idx_units = headers.index('units')
+                idx_sku = headers.index('sku')
+                idx_wdf = headers.index('weight_division_factor') if 'weight_division_factor' in header_set else None
+                idx_ocq = headers.index('outer_case_quantity') if 'outer_case_quantity' in header_set else None
+                idx_minqty = headers.index('minimum_qty') if 'minimum_qty' in header_set else None
                 
-                # BULK FETCH: Single query with .only() for speed
-                items_qs = Item.objects.filter(platform=platform).only(
-                    'id', 'item_code', 'units', 'sku', 'weight_division_factor', 'outer_case_quantity', 'minimum_qty'
-                )
+                errors = []
                 
-                # Build lookup dict
-                items_dict = {(i.item_code, i.units, i.sku): i for i in items_qs}
+                def parse_rows():
+                    """Yield validated row dicts lazily (fast - no DB)."""
+                    for row_num, row in enumerate(csv_reader, start=2):
+                        if not row:
+                            continue  # Blank line (DictReader skipped these too)
+                        if len(row) < header_width:
+                            row += [''] * (header_width - len(row))
+                        item_code = row[idx_item_code].strip()
+                        units = row[idx_units].strip()
+                        sku = row[idx_sku].strip()
+                        
+                        if not item_code or not units or not sku:
+                            errors.append(f"Row {row_num}: Missing required fields")
+                            continue
+                        
+                        # Validate numeric fields by pattern only (None = not provided);
+                        # values are kept as text and parsed later only if they differ
+                        wdf = (row[idx_wdf].strip() or None) if idx_wdf is not None else None
+                        ocq = (row[idx_ocq].strip() or None) if idx_ocq is not None else None
+                        minqty = (row[idx_minqty].strip() or None) if idx_minqty is not None else None
+                        if wdf is not None and not DECIMAL_PATTERN.match(wdf):
+                            errors.append(f"Row {row_num}: Invalid WDF")
+                            continue
+                        if ocq is not None and not INTEGER_PATTERN.match(ocq):
+                            errors.append(f"Row {row_num}: Invalid OCQ")
+                            continue
+                        if minqty is not None and not INTEGER_PATTERN.match(minqty):
+                            errors.append(f"Row {row_num}: Invalid MinQty")
+                            continue
+                        
+                        yield {
+                            'row_num': row_num,
+                            'item_code': item_code,
+                            'units': units,
+                            'sku': sku,
+                            'wdf': wdf,
+                            'ocq': ocq,
+                            'minqty': minqty
+                        }
                 
-                # Process rows - FAST: just update values, no change detection needed
-                items_to_update = []
+                # Process in bounded batches: fetch, compare and write one batch at a
+                # time so memory stays flat regardless of CSV size
+                BATCH_SIZE = 10000
+                valid_row_count = 0
                 updated_count = 0
-                not_found_items = []
+                unchanged_count = 0
+                not_found_count = 0
                 
-                for row_data in csv_rows:
-                    key = (row_data['item_code'], row_data['units'], row_data['sku'])
-                    item = items_dict.get(key)
-                    
-                    if not item:
-                        not_found_items.append(f"{row_data['item_code']} ({row_data['units']})")
-                        continue
+                for csv_rows in iter_csv_batches(parse_rows(), BATCH_SIZE):
+                    valid_row_count += len(csv_rows)
                     
-                    item_changed = False
+                    # BULK FETCH: Only the items referenced by this batch, keyed by
+                    # lowercased (item_code, units, sku)
+                    items_dict, ambiguous_keys = fetch_items_by_csv_keys(platform, csv_rows, (
+                        'id', 'item_code', 'units', 'sku', 'weight_division_factor', 'outer_case_quantity', 'minimum_qty'
+                    ))
                     
-                    # Update WDF if provided
-                    if row_data['wdf']:
-                        try:
-                            item.weight_division_factor = Decimal(row_data['wdf'])
-                            item_changed = True
-                        except (InvalidOperation, ValueError):
-                            errors.append(f"Row {row_data['row_num']}: Invalid WDF")
+                    # Unchanged items are skipped; matching text short-circuits parsing.
+                    # Changes are collected as (id, wdf, ocq, minqty) rows
+                    rows_to_update = []
+                    for row_data in csv_rows:
+                        key = (row_data['item_code'].lower(), row_data['units'].lower(), row_data['sku'].lower())
+                        if key in ambiguous_keys:
+                            errors.append(f"Row {row_data['row_num']}: {AMBIGUOUS_CSV_KEY_ERROR}")
                             continue
-                    
-                    # Update OCQ if provided
-                    if row_data['ocq']:
-                        try:
-                            item.outer_case_quantity = int(row_data['ocq'])
-                            item_changed = True
-                        except ValueError:
-                            errors.append(f"Row {row_data['row_num']}: Invalid OCQ")
+                        item = items_dict.get(key)
+                        
+                        if not item:
+                            not_found_count += 1
                             continue
-                    
-                    # Update MinQty if provided
-                    if row_data['minqty']:
-                        try:
-                            item.minimum_qty = int(row_data['minqty'])
-                            item_changed = True
-                        except ValueError:
-                            errors.append(f"Row {row_data['row_num']}: Invalid MinQty")
+                        
+                        # Blank CSV values keep the current value
+                        current = (item.weight_division_factor, item.outer_case_quantity, item.minimum_qty)
+                        new_values = (
+                            csv_value_or_current(row_data['wdf'], current[0], Decimal),
+                            csv_value_or_current(row_data['ocq'], current[1], int),
+                            csv_value_or_current(row_data['minqty'], current[2], int),
+                        )
+                        if new_values == current:
+                            unchanged_count += 1
                             continue
+                        
+                        rows_to_update.append((item.id, *new_values))
                     
-                    if item_changed:
-                        items_to_update.append(item)
-                        updated_count += 1
+                    # One transaction per batch (UPDATE ... FROM VALUES, no CASE/WHEN);
+                    # earlier batches stay committed if a later one fails
+                    if rows_to_update:
+                        with transaction.atomic():
+                            fast_bulk_update_rows(
+                                Item,
+                                rows_to_update,
+                                ['weight_division_factor', 'outer_case_quantity', 'minimum_qty']
+                            )
+                        updated_count += len(rows_to_update)
                 
-                # Bulk update all items at once
-                if items_to_update:
-                    Item.objects.bulk_update(
-                        items_to_update,
-                        ['weight_division_factor', 'outer_case_quantity', 'minimum_qty']
-                    )
+                if not valid_row_count:
+                    messages.warning(request, "No valid rows found in CSV")
+                    return redirect('integration:rules_update_stock')
                 
                 # Display consolidated messages
                 if updated_count > 0:
                     messages.success(request, f"Successfully updated {updated_count} item(s) for {platform.title()} platform")
                 
-                if not_found_items:
-                    messages.warning(request, f"{len(not_found_items)} item(s) not found")
+                if unchanged_count > 0:
+                    messages.info(request, f"{unchanged_count} item(s) already up-to-date")
+                
+                if not_found_count:
+                    messages.warning(request, f"{not_found_count} item(s) not found")
                 
                 if errors:
                     messages.error(request, f"{len(errors)} error(s) occurred")
                 
                 # Log upload history
                 from .models import UploadHistory
-                total_records = updated_count + len(not_found_items) + len(errors)
+                total_records = updated_count + unchanged_count + not_found_count + len(errors)
                 upload_status = 'success' if not errors else ('partial' if updated_count else 'failed')
                 UploadHistory.objects.create(
                     file_name=csv_file.name,
@@ -2063,7 +2266,7 @@ def rules_update_stock(request):
                     records_total=total_records,
                     records_success=updated_count,
                     records_failed=len(errors),
-                    records_skipped=len(not_found_items),
+                    records_skipped=not_found_count + unchanged_count,
                     status=upload_status,
                     uploaded_by=request.user if request.user.is_authenticated else None,
                 )
@@ -2095,7 +2298,6 @@ def search_product_api(request):
     """
     from .models import Item
     from django.db import models
-    from django.core.paginator import Paginator
     
     # Determine platform and whether this is bulk mode (item deletion page)
     platform = request.GET.get('platform', '').strip()
@@ -2130,13 +2332,9 @@ def search_product_api(request):
             description = request.GET.get('description', '').strip()
             barcode = request.GET.get('barcode', '').strip()
             sku = request.GET.get('sku', '').strip()
-            price_min = request.GET.get('price_min', '').strip()
-            price_max = request.GET.get('price_max', '').strip()
-            stock_min = request.GET.get('stock_min', '').strip()
-            stock_max = request.GET.get('stock_max', '').strip()
 
             qs = Item.objects.all() if include_inactive else Item.objects.filter(is_active=True)
-            if platform in ('pasons', 'talabat'):
+            if platform in VALID_PLATFORMS:
                 qs = qs.filter(platform=platform)
             elif platform == 'all':
                 qs = qs.filter(platform__in=['pasons', 'talabat'])
@@ -2150,72 +2348,95 @@ def search_product_api(request):
                 qs = qs.filter(barcode__icontains=barcode)
             if sku:
                 qs = qs.filter(sku__icontains=sku)
-            # Numeric filters
-            try:
-                if price_min:
-                    qs = qs.filter(selling_price__gte=float(price_min))
-            except ValueError:
-                pass
-            try:
-                if price_max:
-                    qs = qs.filter(selling_price__lte=float(price_max))
-            except ValueError:
-                pass
-            try:
-                if stock_min:
-                    qs = qs.filter(stock__gte=int(stock_min))
-            except ValueError:
-                pass
-            try:
-                if stock_max:
-                    qs = qs.filter(stock__lte=int(stock_max))
-            except ValueError:
-                pass
-
-            qs = qs.order_by('item_code')
-
-            # Pagination
-            paginator = Paginator(qs, page_size)
-            page_obj = paginator.get_page(page)
+            # Numeric filters - coerce once, apply in a single filter() call
+            # (invalid values are ignored, as before)
+            numeric_filters = {}
+            for param, lookup, coerce in SEARCH_NUMERIC_FILTERS:
+                raw_value = request.GET.get(param, '').strip()
+                if raw_value:
+                    try:
+                        numeric_filters[lookup] = coerce(raw_value)
+                    except ValueError:
+                        pass
+            if numeric_filters:
+                qs = qs.filter(**numeric_filters)
+
+            # Plain dict rows - no model instantiation for the page
+            qs = qs.order_by('item_code').values(
+                'id', 'item_code', 'description', 'pack_description', 'sku', 'units',
+                'selling_price', 'stock', 'mrp', 'cost', 'is_active',
+                'price_locked', 'status_locked', 'barcode', 'wrap',
+                'weight_division_factor', 'outer_case_quantity', 'minimum_qty', 'talabat_margin'
+            )
 
+            # Pagination: plain OFFSET/LIMIT, fetching one extra row to detect a next
+            # page. total_items is returned by default; clients that already hold the
+            # totals (e.g. paging through an unchanged listing) can pass skip_total=1
+            # to avoid the COUNT(*).
+            if page < 1:
+                page = 1
+            skip_total = request.GET.get('skip_total', '').strip() in ('1', 'true', 'True')
+
+            def count_pages():
+                total = qs.count()
+                return total, max(1, -(-total // page_size))
+
+            def fetch_page(page_number):
+                offset = (page_number - 1) * page_size
+                return list(qs[offset:offset + page_size + 1])
+
+            total_items = total_pages = None
+            if not skip_total:
+                total_items, total_pages = count_pages()
+                # Out-of-range pages show the last page (as Paginator.get_page() did)
+                page = min(page, total_pages)
+            rows = fetch_page(page)
+            if not rows and page > 1 and total_items is None:
+                # Past the end without a count: count once and clamp to the last page
+                total_items, total_pages = count_pages()
+                page = total_pages
+                rows = fetch_page(page)
+            has_next = len(rows) > page_size
+
+            include_margin = platform == 'talabat'
             items_data = []
-            for item in page_obj.object_list:
-                combination_key = f"{item.item_code}|{item.description}|{item.sku}"
+            for row in rows[:page_size]:
+                talabat_margin = row['talabat_margin']
                 items_data.append({
-                    'id': item.id,
-                    'item_code': item.item_code,
-                    'description': item.description,
-                    'pack_description': item.pack_description or '',
-                    'sku': item.sku,
-                    'units': item.units,
-                    'selling_price': float(item.selling_price),
-                    'stock': item.stock,
-                    'mrp': float(item.mrp),
-                    'cost': float(item.cost),
-                    'is_active': item.is_active,
+                    'id': row['id'],
+                    'item_code': row['item_code'],
+                    'description': row['description'],
+                    'pack_description': row['pack_description'] or '',
+                    'sku': row['sku'],
+                    'units': row['units'],
+                    'selling_price': float(row['selling_price']),
+                    'stock': row['stock'],
+                    'mrp': float(row['mrp']),
+                    'cost': float(row['cost']),
+                    'is_active': row['is_active'],
                     # CLS flags for UI consistency
-                    'price_locked': bool(getattr(item, 'price_locked', False)),
-                    'status_locked': bool(getattr(item, 'status_locked', False)),
-                    'barcode': item.barcode or '',
-                    'wrap': item.wrap or '',
-                    'weight_division_factor': item.weight_division_factor,
-                    'outer_case_quantity': item.outer_case_quantity,
-                    'minimum_qty': item.minimum_qty,
-                    'talabat_margin': float(item.talabat_margin) if platform == 'talabat' and item.talabat_margin is not None else None,
-                    'combination_key': combination_key
+                    'price_locked': row['price_locked'],
+                    'status_locked': row['status_locked'],
+                    'barcode': row['barcode'] or '',
+                    'wrap': row['wrap'] or '',
+                    'weight_division_factor': row['weight_division_factor'],
+                    'outer_case_quantity': row['outer_case_quantity'],
+                    'minimum_qty': row['minimum_qty'],
+                    'talabat_margin': float(talabat_margin) if include_margin and talabat_margin is not None else None,
+                    'combination_key': f"{row['item_code']}|{row['description']}|{row['sku']}"
                 })
 
             return JsonResponse({
                 'success': True,
                 'items': items_data,
-                'page': page_obj.number,
+                'page': page,
                 'page_size': page_size,
-                'total_items': paginator.count,
-                'total_pages': paginator.num_pages,
-                'has_next': page_obj.has_next(),
-                'has_previous': page_obj.has_previous(),
-                'next_page': page_obj.next_page_number() if page_obj.has_next() else None,
-                'previous_page': page_obj.previous_page_number() if page_obj.has_previous() else None,
+                'total_items': total_items,
+                'total_pages': total_pages,
+                'has_next': has_next,
+                'has_previous': page > 1,
+                'next_page': page + 1 if has_next else None,
+                'previous_page': page - 1 if page > 1 else None,
             })
         except Exception as e:
             return JsonResponse({
@@ -2228,51 +2449,69 @@ def search_product_api(request):
     if not query:
         return JsonResponse({'found': False, 'message': 'No search query provided'})
     
-    try:
-        # Base queryset restricted by platform. Honor include_inactive for consistency.
-        qs = Item.objects.all() if include_inactive else Item.objects.filter(is_active=True)
-        if platform in ('pasons', 'talabat'):
-            qs = qs.filter(platform=platform)
-        elif platform == 'all':
-            qs = qs.filter(platform__in=['pasons', 'talabat'])
-        # Search by item_code, sku, barcode, or description
-        qs = qs.filter(
+    # Base queryset restricted by platform. Honor include_inactive for consistency.
+    qs = Item.objects.all() if include_inactive else Item.objects.filter(is_active=True)
+    if platform in VALID_PLATFORMS:
+        qs = qs.filter(platform=platform)
+    elif platform == 'all':
+        qs = qs.filter(platform__in=['pasons', 'talabat'])
+    
+    def find_item_ids():
+        # Exact item_code/sku/barcode matches first; the substring scans below
+        # only run when nothing matches exactly
+        item_ids = list(qs.filter(
             models.Q(item_code__iexact=query) |
             models.Q(sku__iexact=query) |
-            models.Q(barcode__iexact=query) |
-            models.Q(description__icontains=query) |
-            models.Q(item_code__icontains=query) |
-            models.Q(sku__icontains=query)
-        )[:20]  # Limit to 20 results
+            models.Q(barcode__iexact=query)
+        ).values_list('id', flat=True)[:20])  # Limit to 20 results
+        if not item_ids:
+            item_ids = list(qs.filter(
+                models.Q(description__icontains=query) |
+                models.Q(item_code__icontains=query) |
+                models.Q(sku__icontains=query)
+            ).values_list('id', flat=True)[:20])
+        return item_ids
+    
+    def load_items(item_ids):
+        # Prices, stock and lock flags are read fresh: the edit form is filled from
+        # this response and posted back whole, so a stale row would overwrite saves
+        items_by_id = qs.in_bulk(item_ids)
+        items_data = []
+        for item in (items_by_id[pk] for pk in item_ids if pk in items_by_id):
+            # Create unique combination key for item_code + item_name + sku
+            combination_key = f"{item.item_code}|{item.description}|{item.sku}"
+            
+            items_data.append({
+                'id': item.id,
+                'item_code': item.item_code,
+                'description': item.description,
+                'pack_description': item.pack_description or '',
+                'sku': item.sku,
+                'units': item.units,
+                'selling_price': float(item.selling_price),
+                'stock': item.stock,
+                'mrp': float(item.mrp),
+                'cost': float(item.cost),
+                'price_locked': item.price_locked,
+                'status_locked': item.status_locked,
+                'barcode': item.barcode or '',
+                'wrap': item.wrap or '',
+                'weight_division_factor': item.weight_division_factor,
+                'outer_case_quantity': item.outer_case_quantity,
+                'minimum_qty': item.minimum_qty,
+                'talabat_margin': float(item.talabat_margin) if platform == 'talabat' and item.talabat_margin is not None else None,
+                'combination_key': combination_key
+            })
+        return items_data
+    
+    try:
+        # Cache by normalized query (lookups are case-insensitive); hashed to keep keys backend-safe
+        query_hash = hashlib.md5(query.lower().encode('utf-8')).hexdigest()
+        cache_key = f"search_product_ids:{platform}:{int(include_inactive)}:{query_hash}"
+        item_ids = cache.get_or_set(cache_key, find_item_ids, SEARCH_CACHE_TIMEOUT)
+        items_data = load_items(item_ids) if item_ids else []
         
-        if qs.exists():
-            items_data = []
-            for item in qs:
-                # Create unique combination key for item_code + item_name + sku
-                combination_key = f"{item.item_code}|{item.description}|{item.sku}"
-                
-                items_data.append({
-                    'id': item.id,
-                    'item_code': item.item_code,
-                    'description': item.description,
-                    'pack_description': item.pack_description or '',
-                    'sku': item.sku,
-                    'units': item.units,
-                    'selling_price': float(item.selling_price),
-                    'stock': item.stock,
-                    'mrp': float(item.mrp),
-                    'cost': float(item.cost),
-                    'price_locked': bool(getattr(item, 'price_locked', False)),
-                    'status_locked': bool(getattr(item, 'status_locked', False)),
-                    'barcode': item.barcode or '',
-                    'wrap': item.wrap or '',
-                    'weight_division_factor': item.weight_division_factor,
-                    'outer_case_quantity': item.outer_case_quantity,
-                    'minimum_qty': item.minimum_qty,
-                    'talabat_margin': float(item.talabat_margin) if platform == 'talabat' and item.talabat_margin is not None else None,
-                    'combination_key': combination_key
-                })
-            
+        if items_data:
             return JsonResponse({
                 'success': True,
                 'items': items_data,
@@ -2309,24 +2548,7 @@ def calculate_outlet_enabled_status(item, outlet_stock):
     Returns:
         bool: True = Enabled (stock_status=1), False = Disabled (stock_status=0)
     """
-    stock = outlet_stock or 0
-    
-    # Rule 1: No stock or negative stock = Always Disabled
-    if stock <= 0:
-        return False
-    
-    # Rule 2: outlet_stock is ALREADY converted (no further division needed)
-    # wrap=9900: already multiplied by WDF during stock update
-    # wrap=10000: already divided by OCQ during stock update
-    
-    # Rule 3: Check if stock is GREATER THAN minimum_qty requirement
-    min_qty = item.minimum_qty
-    if min_qty is not None and min_qty > 0:
-        if stock <= min_qty:  # Must be GREATER than (not equal)
-            return False
-    
-    # All checks passed = Enabled
-    return True
+    return outlet_enabled_status(outlet_stock, item.minimum_qty)
 
 
 @login_required
@@ -2354,36 +2576,63 @@ def item_outlets_api(request):
     include_inactive = request.GET.get('include_inactive', '').strip() in ('1', 'true', 'True')
 
     # STRICT ISOLATION: Only 'pasons' or 'talabat' allowed
-    if platform not in ('pasons', 'talabat'):
+    if platform not in VALID_PLATFORMS:
         return JsonResponse({'success': False, 'message': 'Invalid or missing platform'})
 
     try:
         item = None
         if item_id:
+            # Primary key lookups are unique: get() without the ORDER BY of first()
             try:
                 if include_inactive:
-                    item = Item.objects.filter(pk=int(item_id)).first()
+                    item = Item.objects.get(pk=int(item_id))
                 else:
-                    item = Item.objects.filter(pk=int(item_id), is_active=True).first()
-            except ValueError:
+                    item = Item.objects.get(pk=int(item_id), is_active=True)
+            except (ValueError, Item.DoesNotExist):
                 item = None
+        if item is None and item_code:
+            # The (item_code, sku/units) -> id resolution is stable, so it is cached;
+            # the item is then re-read by primary key for current values. A stale id
+            # (deleted, deactivated or re-coded item) falls through to a fresh lookup.
+            lookup_key = f"{item_code}|{sku}|{'' if sku else units}".lower()
+            lookup_cache_key = (
+                f"item_outlets_item:{platform}:{int(include_inactive)}:"
+                f"{hashlib.md5(lookup_key.encode('utf-8')).hexdigest()}"
+            )
+            cached_item_id = cache.get(lookup_cache_key)
+            if cached_item_id is not None:
+                item_qs = Item.objects.filter(pk=cached_item_id, platform=platform)
+                if not include_inactive:
+                    item_qs = item_qs.filter(is_active=True)
+                try:
+                    item = item_qs.get()
+                except Item.DoesNotExist:
+                    item = None
+                if item is not None and (
+                    item.item_code.lower() != item_code.lower()
+                    or (sku and item.sku.lower() != sku.lower())
+                    or (not sku and units and item.units.lower() != units.lower())
+                ):
+                    item = None
         if item is None and item_code:
             # FIXED: Filter by item_code, units, sku, AND platform for unique identification
             # Platform is CRITICAL - same item_code can exist on both Pasons and Talabat!
-            item_filter = {'item_code__iexact': item_code}
+            item_filter = {'item_code__lower': Lower(Value(item_code))}
             
             # CRITICAL FIX: Filter by platform to ensure we get the right item!
             # Without this, Talabat dashboard might find a Pasons item and show no outlets!
-            if platform in ('pasons', 'talabat'):
+            if platform in VALID_PLATFORMS:
                 item_filter['platform'] = platform
             
             if sku:  # SKU is the most specific - use it first
                 item_filter['sku__iexact'] = sku
             elif units:  # Fallback to units if no SKU
-                item_filter['units__iexact'] = units
+                item_filter['units__lower'] = Lower(Value(units))
             if not include_inactive:
                 item_filter['is_active'] = True
             item = Item.objects.filter(**item_filter).first()
+            if item is not None:
+                cache.set(lookup_cache_key, item.pk, ITEM_LOOKUP_CACHE_TIMEOUT)
 
         if item is None:
             return JsonResponse({'success': True, 'product': None, 'outlets': []})
@@ -2396,63 +2645,68 @@ def item_outlets_api(request):
             item=item,
             outlet__is_active=True,
             **pfilter
+        ).only(
+            'outlet__name', 'outlet__store_id', 'outlet__location', 'outlet__platforms',
+            'outlet_selling_price', 'outlet_stock', 'outlet_cost', 'outlet_mrp',
+            'is_active_in_outlet', 'price_locked', 'status_locked'
+        ).annotate(
+            calculated_enabled=outlet_enabled_status_expression()
         ).order_by('outlet__name')
 
+        # Single query: an empty queryset simply yields no outlets
         outlets = []
-        if io_qs.exists():
-            for io in io_qs:
-                # Display outlet-specific selling price
-                # Always show original outlet_selling_price - promo price is separate
-                if io.outlet_selling_price is not None:
-                    price = io.outlet_selling_price
-                else:
-                    price = 0.00
-                
-                # Calculate enabled status based on stock rules
-                # Only show as Enabled if: has stock AND meets quantity requirements
-                calculated_enabled = calculate_outlet_enabled_status(item, io.outlet_stock)
-                
-                # Final status: Must pass both manual flag AND stock rules
-                # If manually disabled (is_active_in_outlet=False), stay disabled
-                # If stock rules fail, show disabled regardless of manual flag
-                effective_active = io.is_active_in_outlet and calculated_enabled
-                
-                # Calculate converted cost based on wrap type
-                # wrap=9900: Use WDF for conversion
-                # wrap=10000: No conversion needed
-                if io.outlet_cost is not None and item.wrap == '9900':
-                    # Use centralized validation for wrap=9900 items
-                    wdf = validate_wdf_for_division(
-                        item.weight_division_factor,
-                        str(item.item_code),
-                        'converted cost calculation'
-                    )
-                    outlet_converted_cost = float((io.outlet_cost / wdf).quantize(Decimal('0.001')))
-                else:
-                    # wrap=10000 or no cost: use cost as-is
-                    outlet_converted_cost = float(io.outlet_cost) if io.outlet_cost is not None else 0.00
-                
-                outlets.append({
-                    'outlet_name': io.outlet.name,
-                    'store_id': io.outlet.store_id,
-                    'location': io.outlet.location,
-                    'platform': io.outlet.platforms,
-                    'price': float(price),
-                    'stock': io.outlet_stock,
-                    'active': effective_active,  # Now auto-calculated!
-                    'stock_status_reason': 'ok' if calculated_enabled else 'insufficient_stock',
-                    # Cost fields (OUTLET-LEVEL)
-                    'outlet_cost': float(io.outlet_cost) if io.outlet_cost is not None else 0.00,
-                    'outlet_converted_cost': outlet_converted_cost,
-                    # MRP and S.Price (OUTLET-SPECIFIC, not global)
-                    'outlet_mrp': float(io.outlet_mrp) if io.outlet_mrp is not None else 0.00,
-                    'outlet_selling_price': float(price),
-                    # BLS states
-                    'locked': bool(getattr(io, 'price_locked', False)),
-                    'price_locked': bool(getattr(io, 'price_locked', False)),
-                    'status_locked': bool(getattr(io, 'status_locked', False)),
-                    'associated': True,
-                })
+        for io in io_qs:
+            # Display outlet-specific selling price
+            # Always show original outlet_selling_price - promo price is separate
+            if io.outlet_selling_price is not None:
+                price = io.outlet_selling_price
+            else:
+                price = 0.00
+            
+            # Enabled status based on stock rules (computed by the database)
+            # Only show as Enabled if: has stock AND meets quantity requirements
+            calculated_enabled = io.calculated_enabled
+            
+            # Final status: Must pass both manual flag AND stock rules
+            # If manually disabled (is_active_in_outlet=False), stay disabled
+            # If stock rules fail, show disabled regardless of manual flag
+            effective_active = io.is_active_in_outlet and calculated_enabled
+            
+            # Calculate converted cost based on wrap type
+            # wrap=9900: Use WDF for conversion
+            # wrap=10000: No conversion needed
+            if io.outlet_cost is not None and item.wrap == '9900':
+                # Use centralized validation for wrap=9900 items
+                wdf = validate_wdf_for_division(
+                    item.weight_division_factor,
+                    str(item.item_code),
+                    'converted cost calculation'
+                )
+                outlet_converted_cost = float((io.outlet_cost / wdf).quantize(Decimal('0.001')))
+            else:
+                # wrap=10000 or no cost: use cost as-is
+                outlet_converted_cost = float(io.outlet_cost) if io.outlet_cost is not None else 0.00
+            
+            outlets.append({
+                'outlet_name': io.outlet.name,
+                'store_id': io.outlet.store_id,
+                'location': io.outlet.location,
+                'platform': io.outlet.platforms,
+                'price': float(price),
+                'stock': io.outlet_stock,
+                'active': effective_active,  # Now auto-calculated!
+                'stock_status_reason': 'ok' if calculated_enabled else 'insufficient_stock',
+                # Cost fields (OUTLET-LEVEL)
+                'outlet_cost': float(io.outlet_cost) if io.outlet_cost is not None else 0.00,
+                'outlet_converted_cost': outlet_converted_cost,
+                # MRP and S.Price (OUTLET-SPECIFIC, not global)
+                'outlet_mrp': float(io.outlet_mrp) if io.outlet_mrp is not None else 0.00,
+                'outlet_selling_price': float(price),
+                # BLS states ('locked' alias dropped - dashboard.js reads price_locked)
+                'price_locked': io.price_locked,
+                'status_locked': io.status_locked,
+                'associated': True,
+            })
         # No fallback - if no ItemOutlet records, return empty outlets list
         # Outlets only appear AFTER price/stock is updated via price-update
 
@@ -2471,27 +2725,179 @@ def item_outlets_api(request):
             # Talabat margin (uses actual talabat_margin field to show saved values including 0%)
             'talabat_margin': float(item.talabat_margin) if item.platform == 'talabat' and item.talabat_margin is not None else None,
             # CLS states
-            'price_locked': bool(getattr(item, 'price_locked', False)),
-            'status_locked': bool(getattr(item, 'status_locked', False)),
+            'price_locked': item.price_locked,
+            'status_locked': item.status_locked,
         }
 
-        return JsonResponse({'success': True, 'product': product, 'outlets': outlets})
+        # Compact separators: one entry per outlet, so whitespace adds up on large responses
+        return JsonResponse(
+            {'success': True, 'product': product, 'outlets': outlets},
+            json_dumps_params={'separators': (',', ':')}
+        )
     except Exception as e:
         import traceback
         traceback.print_exc()
         return JsonResponse({'success': False, 'message': f'Outlet availability error: {str(e)}'})
 
 
+def parse_bool(val):
+    """Return True for checkbox/flag style values ('on', 'true', '1', 'yes', 'lock', 'locked')."""
+    return str(val).strip().lower() in TRUTHY_VALUES
+
+
+def parse_lock_value(value_raw):
+    """Map a lock API 'value' to True (lock), False (unlock) or None (toggle)."""
+    if value_raw in LOCK_VALUES:
+        return True
+    if value_raw in UNLOCK_VALUES:
+        return False
+    return None
+
+
+def get_active_outlet(store_id):
+    """
+    Return the active Outlet for a store_id, or None.
+    
+    Outlets are reference data that rarely change, so (pk, store_id, platforms) is
+    cached for OUTLET_CACHE_TIMEOUT seconds and the instance is rebuilt from it with
+    every other field deferred. signals.py drops the entry when the Outlet is saved
+    or deleted.
+    
+    STALENESS: with the default per-process LocMemCache the signal only clears the
+    entry in the worker that saved the Outlet. Other workers keep serving the old
+    (pk, store_id, platforms) - including an outlet that was just deactivated - for
+    up to OUTLET_CACHE_TIMEOUT seconds. Configure a shared cache (Redis/Memcached)
+    in CACHES for cross-worker invalidation.
+    """
+    from .models import Outlet
+    
+    key = outlet_cache_key(store_id)
+    cached = cache.get(key)
+    if cached is None:
+        row = Outlet.objects.filter(store_id=store_id, is_active=True).values_list(
+            'id', 'store_id', 'platforms'
+        ).first()
+        if row is None:
+            return None
+        cached = tuple(row)
+        cache.set(key, cached, OUTLET_CACHE_TIMEOUT)
+    # Tag the instance with the alias the router reads Outlets from, not a hardcoded one
+    return Outlet.from_db(router.db_for_read(Outlet), ['id', 'store_id', 'platforms'], list(cached))
+
+
+def item_outlet_link_filter(store_id, item_pk=None, item_code='', units='', platform=None):
+    """
+    Build ItemOutlet filter kwargs matching an existing item/outlet link.
+    
+    Both sides must be active and the item must be on ``platform`` (or on the
+    outlet's platform when not given). The item is matched by primary key, else by
+    item_code (and units) case-insensitively.
+    
+    Returns:
+        dict: filter kwargs, or None when neither item_pk nor item_code is given
+    """
+    if item_pk is None and not item_code:
+        return None
+    io_filter = {
+        'outlet__store_id': store_id,
+        'outlet__is_active': True,
+        'item__is_active': True,
+        'item__platform': platform if platform else F('outlet__platforms'),
+    }
+    if item_pk is not None:
+        io_filter['item__pk'] = item_pk
+    else:
+        io_filter['item__item_code__lower'] = Lower(Value(item_code))
+        if units:
+            io_filter['item__units__lower'] = Lower(Value(units))
+    return io_filter
+
+
+def parse_item_pk(item_id):
+    """Return item_id as an int primary key, or None when empty/invalid."""
+    try:
+        return int(item_id) if item_id else None
+    except ValueError:
+        return None
+
+
+def resolve_item_outlet(store_id, item_id='', item_code='', units='', platform=None, try_link=True):
+    """
+    Resolve the active Item, active Outlet and their ItemOutlet link for the outlet APIs.
+    
+    Tries a single ItemOutlet query joined to Item and Outlet first, which covers the
+    common case of an existing link. Only when no link exists are Item and Outlet
+    looked up separately (by item_id when given, else by item_code/units). Only the
+    columns the outlet APIs read are loaded (see the field tuples below).
+    
+    Args:
+        store_id (str): Outlet store_id
+        item_id (str): Item primary key (optional)
+        item_code (str): Item code, matched case-insensitively (optional)
+        units (str): Units, narrows an item_code match when given
+        platform (str): Item platform; defaults to the outlet's platform
+        try_link (bool): False when the caller already found no existing link
+    
+    Returns:
+        tuple: (item, outlet, item_outlet) - any of them may be None
+    """
+    from .models import Item, ItemOutlet
+    
+    item_fields = ('item_code', 'platform', 'price_locked', 'status_locked', 'selling_price', 'minimum_qty')
+    outlet_fields = ('store_id', 'platforms')
+    io_fields = ('item_id', 'outlet_id', 'price_locked', 'status_locked', 'is_active_in_outlet', 'outlet_stock')
+    
+    item_pk = parse_item_pk(item_id)
+    
+    # Fast path: existing link - one query, item and outlet come from the join
+    io_filter = item_outlet_link_filter(store_id, item_pk, item_code, units, platform) if try_link else None
+    if io_filter is not None:
+        io = ItemOutlet.objects.select_related('item', 'outlet').filter(**io_filter).only(
+            *io_fields,
+            *(f'item__{name}' for name in item_fields),
+            *(f'outlet__{name}' for name in outlet_fields)
+        ).first()
+        if io is not None:
+            return io.item, io.outlet, io
+    
+    # No link yet: resolve item and outlet on their own
+    outlet = get_active_outlet(store_id)
+    if platform is None:
+        if outlet is None:
+            return None, None, None
+        platform = outlet.platforms
+    
+    # item_id wins outright (same as the link filter); item_code/units only when absent
+    item = None
+    if item_pk is not None:
+        try:
+            item = Item.objects.only(*item_fields).get(pk=item_pk, platform=platform, is_active=True)
+        except Item.DoesNotExist:
+            item = None
+    elif item_code:
+        # Filter by item_code, units AND platform for unique identification
+        item_filter = {'item_code__lower': Lower(Value(item_code)), 'platform': platform, 'is_active': True}
+        if units:  # If units provided, use it for exact match
+            item_filter['units__lower'] = Lower(Value(units))
+        item = Item.objects.filter(**item_filter).only(*item_fields).first()
+    
+    io = None
+    if item is not None and outlet is not None:
+        io = ItemOutlet.objects.filter(item=item, outlet=outlet).only(*io_fields).first()
+    return item, outlet, io
+
+
 @login_required
 def outlet_price_update_api(request):
     """
     Update outlet-specific selling price for an item.
     Expects POST with: item_code or item_id, store_id, price (or new_price).
     """
-    from .models import Item, Outlet, ItemOutlet
+    from .models import ItemOutlet
+    from django.utils import timezone
 
     if request.method != 'POST':
-        return JsonResponse({'success': False, 'message': 'Only POST method allowed'})
+        return static_json_response(POST_ONLY_ERROR)
 
     try:
         item_code = (request.POST.get('item_code') or '').strip()
@@ -2505,9 +2911,13 @@ def outlet_price_update_api(request):
             return JsonResponse({'success': False, 'message': 'store_id is required'})
         if not (item_code or item_id):
             return JsonResponse({'success': False, 'message': 'item_code or item_id is required'})
+        if item_id and not item_id.isdigit():
+            # A malformed item_id is a caller bug - don't silently fall back to item_code
+            logger.warning(f"{request.path}: invalid item_id {item_id!r} from {request.user}")
+            return JsonResponse({'success': False, 'message': 'Invalid item_id'})
         if not price_str:
             return JsonResponse({'success': False, 'message': 'price is required'})
-        if platform not in ('pasons', 'talabat'):
+        if platform not in VALID_PLATFORMS:
             return JsonResponse({'success': False, 'message': 'Invalid or missing platform parameter'})
 
         try:
@@ -2517,40 +2927,52 @@ def outlet_price_update_api(request):
         except (InvalidOperation, ValueError):
             return JsonResponse({'success': False, 'message': 'Invalid price format'})
 
-        # Resolve item with platform filter
-        item = None
-        if item_id:
-            try:
-                item = Item.objects.filter(pk=int(item_id), platform=platform, is_active=True).first()
-            except ValueError:
-                item = None
-        if item is None and item_code:
-            # FIXED: Filter by BOTH item_code AND units for unique identification
-            item_filter = {'item_code__iexact': item_code, 'platform': platform, 'is_active': True}
-            if units:  # If units provided, use it for exact match
-                item_filter['units__iexact'] = units
-            item = Item.objects.filter(**item_filter).first()
-        if item is None:
-            return JsonResponse({'success': False, 'message': 'Item not found or inactive'})
+        # Existing link: read both lock flags in one joined SELECT as a plain dict
+        # and reject or UPDATE without building any model instance
+        link_filter = item_outlet_link_filter(store_id, parse_item_pk(item_id), item_code, units, platform)
+        link = ItemOutlet.objects.filter(**link_filter).values(
+            'pk', 'price_locked', 'item__price_locked', 'item__item_code'
+        ).first()
+        if link is not None:
+            if link['item__price_locked']:
+                return JsonResponse({'success': False, 'message': 'Price is locked at item level (CLS). Unlock to edit.'})
+            if link['price_locked']:
+                return JsonResponse({'success': False, 'message': 'Price is locked for this outlet (BLS). Unlock to edit.'})
+            ItemOutlet.objects.filter(pk=link['pk']).update(
+                outlet_selling_price=new_price,
+                updated_at=timezone.now()
+            )
+            return JsonResponse({
+                'success': True,
+                'message': 'Outlet price updated',
+                'item_code': link['item__item_code'],
+                'store_id': store_id,
+                'price': float(new_price)
+            })
 
-        # Resolve outlet
-        outlet = Outlet.objects.filter(store_id=store_id, is_active=True).first()
+        # No link yet: resolve item (platform filtered) and outlet for auto-linking
+        item, outlet, io = resolve_item_outlet(
+            store_id, item_id, item_code, units, platform=platform, try_link=False
+        )
+        if item is None:
+            return static_json_response(ITEM_NOT_FOUND_ERROR)
         if outlet is None:
-            return JsonResponse({'success': False, 'message': 'Outlet not found or inactive'})
+            return static_json_response(OUTLET_NOT_FOUND_ERROR)
 
         # CHECK CLS PRICE LOCK FIRST - before any ItemOutlet operations
         if bool(getattr(item, 'price_locked', False)):
             return JsonResponse({'success': False, 'message': 'Price is locked at item level (CLS). Unlock to edit.'})
 
-        # Resolve relation - auto-link if item is already on this platform (via other outlets)
-        io = ItemOutlet.objects.filter(item=item, outlet=outlet).first()
+        # Auto-link if item is already on this platform (via other outlets)
         if io is None:
-            # Check if item is already associated with this platform via other outlets
+            # Check if item is already associated with this platform via other outlets.
+            # Items are platform-isolated, so a platform mismatch needs no query and
+            # any existing link of the item is a link on this platform (no JOIN).
             platform = outlet.platforms
-            existing_on_platform = ItemOutlet.objects.filter(
-                item=item,
-                outlet__platforms=platform
-            ).exists()
+            existing_on_platform = (
+                item.platform == platform
+                and ItemOutlet.objects.filter(item=item).exists()
+            )
             
             if not existing_on_platform:
                 # Item is NOT on this platform yet - don't auto-create (would change platform count)
@@ -2572,8 +2994,12 @@ def outlet_price_update_api(request):
         if bool(getattr(io, 'price_locked', False)):
             return JsonResponse({'success': False, 'message': 'Price is locked for this outlet (BLS). Unlock to edit.'})
 
-        io.outlet_selling_price = new_price
-        io.save()
+        # Targeted UPDATE of the one column (plus updated_at, which save() used to
+        # bump via auto_now) instead of re-writing every field of the row
+        ItemOutlet.objects.filter(pk=io.pk).update(
+            outlet_selling_price=new_price,
+            updated_at=timezone.now()
+        )
 
         return JsonResponse({
             'success': True,
@@ -2596,10 +3022,10 @@ def outlet_lock_toggle_api(request):
     Expects POST with: item_code or item_id, store_id, lock_type ('status'|'price'),
     optional 'value' ('true'|'false' or 'lock'|'unlock').
     """
-    from .models import Item, Outlet, ItemOutlet
+    from .models import ItemOutlet
 
     if request.method != 'POST':
-        return JsonResponse({'success': False, 'message': 'Only POST method allowed'})
+        return static_json_response(POST_ONLY_ERROR)
 
     try:
         item_code = (request.POST.get('item_code') or '').strip()
@@ -2613,38 +3039,26 @@ def outlet_lock_toggle_api(request):
             return JsonResponse({'success': False, 'message': 'store_id is required'})
         if not (item_code or item_id):
             return JsonResponse({'success': False, 'message': 'item_code or item_id is required'})
+        if item_id and not item_id.isdigit():
+            # A malformed item_id is a caller bug - don't silently fall back to item_code
+            logger.warning(f"{request.path}: invalid item_id {item_id!r} from {request.user}")
+            return JsonResponse({'success': False, 'message': 'Invalid item_id'})
 
-        # Resolve outlet FIRST to get platform
-        outlet = Outlet.objects.filter(store_id=store_id, is_active=True).first()
+        # Resolve outlet, item (on the outlet's platform) and their link together
+        item, outlet, io = resolve_item_outlet(store_id, item_id, item_code, units)
         if outlet is None:
-            return JsonResponse({'success': False, 'message': 'Outlet not found or inactive'})
+            return static_json_response(OUTLET_NOT_FOUND_ERROR)
         
         platform = outlet.platforms
-
-        # Resolve item - FILTER BY PLATFORM to get correct item
-        item = None
-        if item_id:
-            try:
-                item = Item.objects.filter(pk=int(item_id), is_active=True, platform=platform).first()
-            except ValueError:
-                item = None
-        if item is None and item_code:
-            # FIXED: Filter by item_code, units, AND platform for unique identification
-            item_filter = {'item_code__iexact': item_code, 'is_active': True, 'platform': platform}
-            if units:  # If units provided, use it for exact match
-                item_filter['units__iexact'] = units
-            item = Item.objects.filter(**item_filter).first()
         if item is None:
             return JsonResponse({'success': False, 'message': f'Item not found on {platform} platform or inactive'})
 
-        # Resolve relation - auto-link if item is already on this platform (via other outlets)
-        io = ItemOutlet.objects.filter(item=item, outlet=outlet).first()
+        # Auto-link if item is already on this platform (via other outlets)
         if io is None:
-            # Check if item is already associated with this platform via other outlets
-            existing_on_platform = ItemOutlet.objects.filter(
-                item=item,
-                outlet__platforms=platform
-            ).exists()
+            # Check if item is already associated with this platform via other outlets.
+            # The item was resolved on the outlet's platform, so any existing link of
+            # the item is a link on this platform (no JOIN to Outlet needed).
+            existing_on_platform = ItemOutlet.objects.filter(item=item).exists()
             
             if not existing_on_platform:
                 # Item is NOT on this platform yet - don't auto-create (would change platform count)
@@ -2660,12 +3074,8 @@ def outlet_lock_toggle_api(request):
                 is_active_in_outlet=True
             )
 
-        # Parse desired value
-        desired = None
-        if value_raw in ('true', 'lock', 'locked', '1'):
-            desired = True
-        elif value_raw in ('false', 'unlock', 'unlocked', '0'):
-            desired = False
+        # Parse desired value (None = toggle)
+        desired = parse_lock_value(value_raw)
 
         # Prevent manual BLS Status changes when CLS Status Lock is enabled
         if lock_type == 'status' and bool(getattr(item, 'status_locked', False)):
@@ -2687,20 +3097,17 @@ def outlet_lock_toggle_api(request):
             # UNCHECKED (locked=False) => Enable based on stock rules
             current = bool(getattr(io, 'status_locked', False))
             new_val = (not current) if desired is None else bool(desired)
-            io.status_locked = new_val
             
-            if new_val:
-                # CHECKED: Force disable (ignore stock rules)
-                io.is_active_in_outlet = False
-            else:
-                # UNCHECKED: Enable based on stock rules
-                calculated_enabled = calculate_outlet_enabled_status(item, io.outlet_stock)
-                io.is_active_in_outlet = calculated_enabled
-            
-            io.save(update_fields=['status_locked', 'is_active_in_outlet'])
+            # CHECKED: Force disable (ignore stock rules)
+            # UNCHECKED: Enable based on stock rules, using the already loaded
+            # outlet_stock (no refetch of the row)
+            effective_active = False if new_val else outlet_enabled_status(io.outlet_stock, item.minimum_qty)
             
-            # Return effective status for UI update
-            effective_active = io.is_active_in_outlet
+            # Single UPDATE by pk (no save(), no signals / auto_now round trip)
+            ItemOutlet.objects.filter(pk=io.pk).update(
+                status_locked=new_val,
+                is_active_in_outlet=effective_active
+            )
             
             return JsonResponse({
                 'success': True,
@@ -2708,14 +3115,14 @@ def outlet_lock_toggle_api(request):
                 'store_id': outlet.store_id,
                 'item_code': item.item_code,
                 'active_in_outlet': effective_active,  # Now returns calculated status!
-                'status_locked': io.status_locked,
+                'status_locked': new_val,
             })
         elif lock_type == 'price':
             # BLS: toggle price lock (no immediate UI badge change)
             current = bool(getattr(io, 'price_locked', False))
             new_val = (not current) if desired is None else bool(desired)
             io.price_locked = new_val
-            io.save(update_fields=['price_locked'])
+            ItemOutlet.objects.filter(pk=io.pk).update(price_locked=new_val)
             return JsonResponse({
                 'success': True,
                 'message': 'Outlet price lock toggled',
@@ -2724,7 +3131,7 @@ def outlet_lock_toggle_api(request):
                 'price_locked': io.price_locked,
             })
         else:
-            return JsonResponse({'success': False, 'message': 'Invalid lock_type; use status or price'})
+            return static_json_response(INVALID_LOCK_TYPE_ERROR)
     except Exception as e:
         return JsonResponse({'success': False, 'message': f'Error toggling outlet lock: {str(e)}'})
 
@@ -2741,9 +3148,10 @@ def cls_lock_toggle_api(request):
       - Alternatively for price: 'price_locked' can be provided ('on'|'true'|'1')
     """
     from .models import Item, ItemOutlet
+    from django.db import transaction
 
     if request.method != 'POST':
-        return JsonResponse({'success': False, 'message': 'Only POST method allowed'})
+        return static_json_response(POST_ONLY_ERROR)
 
     try:
         item_code = (request.POST.get('item_code') or '').strip()
@@ -2753,113 +3161,120 @@ def cls_lock_toggle_api(request):
         lock_type = (request.POST.get('lock_type') or 'status').strip().lower()
         value_raw = (request.POST.get('value') or '').strip().lower()
 
-        # Helper to parse boolean-ish values
-        def _parse_bool(val):
-            return str(val).lower() in ('on', 'true', '1', 'yes', 'locked')
+        # Columns read below: lock flags, cascade (platform, minimum_qty) and the
+        # Item pre_save signals run by save(update_fields=...) (wrap, WDF)
+        item_fields = (
+            'item_code', 'platform', 'price_locked', 'status_locked', 'minimum_qty',
+            'wrap', 'weight_division_factor'
+        )
+
+        if item_id and not item_id.isdigit():
+            # A malformed item_id is a caller bug - don't silently fall back to item_code
+            logger.warning(f"{request.path}: invalid item_id {item_id!r} from {request.user}")
+            return JsonResponse({'success': False, 'message': 'Invalid item_id'})
 
-        # Resolve item - FILTER BY PLATFORM for correct item
+        # Resolve item - FILTER BY PLATFORM for correct item; an item_id always
+        # wins over item_code, as in the outlet lock/price APIs
         item = None
-        if item_id:
+        item_pk = parse_item_pk(item_id)
+        if item_pk is not None:
+            item_filter = {'pk': item_pk, 'is_active': True}
+            if platform:
+                item_filter['platform'] = platform
+            # Primary key lookups are unique: get() without the ORDER BY of first()
             try:
-                item_filter = {'pk': int(item_id), 'is_active': True}
-                if platform:
-                    item_filter['platform'] = platform
-                item = Item.objects.filter(**item_filter).first()
-            except ValueError:
+                item = Item.objects.only(*item_fields).get(**item_filter)
+            except Item.DoesNotExist:
                 item = None
-        if item is None and item_code:
-            item_filter = {'item_code__iexact': item_code, 'is_active': True}
+        elif item_code:
+            item_filter = {'item_code__lower': Lower(Value(item_code)), 'is_active': True}
             if platform:
                 item_filter['platform'] = platform
             if units:
-                item_filter['units__iexact'] = units
-            item = Item.objects.filter(**item_filter).first()
+                item_filter['units__lower'] = Lower(Value(units))
+            item = Item.objects.filter(**item_filter).only(*item_fields).first()
         if item is None:
-            return JsonResponse({'success': False, 'message': 'Item not found or inactive'})
+            return static_json_response(ITEM_NOT_FOUND_ERROR)
 
-        # Parse desired value
-        desired = None
-        if value_raw in ('true', 'lock', 'locked', '1'):
-            desired = True
-        elif value_raw in ('false', 'unlock', 'unlocked', '0'):
-            desired = False
+        # Parse desired value (None = toggle)
+        desired = parse_lock_value(value_raw)
 
         if lock_type == 'status':
             current = bool(getattr(item, 'status_locked', False))
             new_val = (not current) if desired is None else bool(desired)
 
-            # Update item CLS status lock
-            item.status_locked = new_val
-            item.save(update_fields=['status_locked'])
-
-            # Cascade to all ItemOutlet rows via model helper
-            cascade_success = True
-            try:
-                item.cascade_cls_status_to_outlets(new_val)
-            except Exception as e:
-                logger.warning(f"CLS status cascade failed for item {item.item_code}: {e}")
-                cascade_success = False
+            # Update item CLS status lock and cascade in one commit; the savepoint
+            # keeps the item lock when only the cascade fails
+            with transaction.atomic():
+                item.status_locked = new_val
+                item.save(update_fields=['status_locked'])
 
-            # Verify cascade by checking ItemOutlet records
-            outlet_locks = ItemOutlet.objects.filter(
-                item=item,
-                outlet__platforms=item.platform
-            ).values('outlet__name', 'status_locked')
-            
-            outlet_lock_summary = {
-                str(ol['outlet__name']): ol['status_locked']
-                for ol in outlet_locks
-            }
+                # Cascade to all ItemOutlet rows via model helper
+                cascade_success = True
+                try:
+                    with transaction.atomic():
+                        item.cascade_cls_status_to_outlets(new_val)
+                except Exception as e:
+                    logger.warning(f"CLS status cascade failed for item {item.item_code}: {e}")
+                    cascade_success = False
 
-            return JsonResponse({
+            response_data = {
                 'success': True,
                 'message': 'CLS Status Lock updated',
                 'item_code': item.item_code,
                 'status_locked': item.status_locked,
                 'cascade_success': cascade_success,
-                'outlet_locks': outlet_lock_summary,  # ← Frontend can refresh with this
-            })
+            }
+            # On success every outlet now carries new_val; only a failed cascade
+            # needs the per-outlet state read back ((name, flag) tuples -> dict)
+            if not cascade_success:
+                response_data['outlet_locks'] = dict(ItemOutlet.objects.filter(
+                    item=item,
+                    outlet__platforms=item.platform
+                ).values_list('outlet__name', 'status_locked'))  # ← Frontend can refresh with this
+
+            return JsonResponse(response_data)
 
         elif lock_type == 'price':
             # Allow either explicit 'price_locked' param or generic 'value'
             if request.POST.get('price_locked') is not None and desired is None:
-                desired = _parse_bool(request.POST.get('price_locked'))
+                desired = parse_bool(request.POST.get('price_locked'))
             current = bool(getattr(item, 'price_locked', False))
             new_val = (not current) if desired is None else bool(desired)
 
-            # Update item CLS price lock
-            item.price_locked = new_val
-            item.save(update_fields=['price_locked'])
-
-            # Cascade to outlets' price locks via model helper
-            cascade_success = True
-            try:
-                item.cascade_cls_price_to_outlets(new_val)
-            except Exception as e:
-                logger.warning(f"CLS price cascade failed for item {item.item_code}: {e}")
-                cascade_success = False
+            # Update item CLS price lock and cascade in one commit; the savepoint
+            # keeps the item lock when only the cascade fails
+            with transaction.atomic():
+                item.price_locked = new_val
+                item.save(update_fields=['price_locked'])
 
-            # Verify cascade by checking ItemOutlet records
-            outlet_locks = ItemOutlet.objects.filter(
-                item=item,
-                outlet__platforms=item.platform
-            ).values('outlet__name', 'price_locked')
-            
-            outlet_lock_summary = {
-                str(ol['outlet__name']): ol['price_locked']
-                for ol in outlet_locks
-            }
+                # Cascade to outlets' price locks via model helper
+                cascade_success = True
+                try:
+                    with transaction.atomic():
+                        item.cascade_cls_price_to_outlets(new_val)
+                except Exception as e:
+                    logger.warning(f"CLS price cascade failed for item {item.item_code}: {e}")
+                    cascade_success = False
 
-            return JsonResponse({
+            response_data = {
                 'success': True,
                 'message': 'CLS Price Lock updated',
                 'item_code': item.item_code,
                 'price_locked': item.price_locked,
                 'cascade_success': cascade_success,
-                'outlet_locks': outlet_lock_summary,  # ← Frontend can refresh with this
-            })
+            }
+            # On success every outlet now carries new_val; only a failed cascade
+            # needs the per-outlet state read back ((name, flag) tuples -> dict)
+            if not cascade_success:
+                response_data['outlet_locks'] = dict(ItemOutlet.objects.filter(
+                    item=item,
+                    outlet__platforms=item.platform
+                ).values_list('outlet__name', 'price_locked'))  # ← Frontend can refresh with this
+
+            return JsonResponse(response_data)
         else:
-            return JsonResponse({'success': False, 'message': 'Invalid lock_type; use status or price'})
+            return static_json_response(INVALID_LOCK_TYPE_ERROR)
 
     except Exception as e:
         return JsonResponse({'success': False, 'message': f'CLS lock toggle error: {str(e)}'})
@@ -2871,10 +3286,12 @@ def save_product_api(request):
     Supports both JSON body and form data
     """
     from .models import Item, ItemOutlet
+    from django.db import transaction
+    from django.utils import timezone
     import json
     
     if request.method != 'POST':
-        return JsonResponse({'success': False, 'message': 'Only POST method allowed'})
+        return static_json_response(POST_ONLY_ERROR)
     
     try:
         # Parse request data - support both JSON and form data
@@ -2919,11 +3336,12 @@ def save_product_api(request):
         minimum_qty = int(minimum_qty_str) if minimum_qty_str else None
         is_active_val = get_val('is_active', '')
         is_active = str(is_active_val).lower() in ('on', 'true', '1', 'yes') if is_active_val else True
-        # CLS toggles
-        def _parse_bool(val):
-            return str(val).lower() in ('on', 'true', '1', 'yes')
-        price_locked_flag = _parse_bool(get_val('price_locked', ''))
-        status_locked_flag = _parse_bool(get_val('status_locked', ''))
+        units = str(get_val('units', ''))
+        # CLS toggles (presence checked once; only provided locks are updated)
+        price_locked_given = 'price_locked' in data
+        status_locked_given = 'status_locked' in data
+        price_locked_flag = parse_bool(get_val('price_locked', ''))
+        status_locked_flag = parse_bool(get_val('status_locked', ''))
         # Note: stock_status is auto-calculated on frontend based on outlet stock (not stored in DB)
 
         # Validate wrap strictly when provided
@@ -2932,95 +3350,127 @@ def save_product_api(request):
         
         # Get platform from request
         platform = str(get_val('platform', '')).strip()
-        if platform not in ('pasons', 'talabat'):
+        if platform not in VALID_PLATFORMS:
             return JsonResponse({'success': False, 'message': 'Invalid or missing platform parameter'})
         
-        # Try to get existing item or create new one - WITH PLATFORM FILTER
-        item, created = Item.objects.get_or_create(
-            platform=platform,  # ✓ Add platform filter for platform isolation
-            item_code=item_code,
-            defaults={
-                'platform': platform,  # ✓ Set platform in defaults
-                'description': name,
-                'pack_description': pack_description,
-                'stock': stock_quantity,
-                'selling_price': selling_price,
-                'mrp': mrp,
-                'sku': sku,
-                'barcode': barcode,
-                'cost': cost,
-                'wrap': wrap,
-                'weight_division_factor': weight_division_factor,
-                'outer_case_quantity': outer_case_quantity,
-                'minimum_qty': minimum_qty,
-                'units': str(get_val('units', '')),
-                'is_active': is_active,
-                'price_locked': price_locked_flag,
-                'status_locked': status_locked_flag,
-                # stock_status is frontend-calculated field (not stored)
-            }
-        )
-        
-        # Calculate converted_cost = cost / weight_division_factor
+        # Calculate converted_cost = cost / weight_division_factor up front so a new
+        # item is inserted with it (previously it was set on the instance and lost)
         if weight_division_factor and weight_division_factor > 0:
-            from decimal import Decimal
             converted_cost = Decimal(str(cost)) / Decimal(str(weight_division_factor))
-            item.converted_cost = converted_cost
-        else:
-            item.converted_cost = None
-        
-        # Track original CLS status to determine cascade needs
-        original_status_locked = item.status_locked if not created else None
-
-        if not created:
-            # Update existing item
-            item.description = name or item.description
-            item.pack_description = pack_description or item.pack_description
-            item.stock = stock_quantity if 'stock' in data or 'stock_quantity' in data else item.stock
-            item.selling_price = selling_price if 'selling_price' in data else item.selling_price
-            item.mrp = mrp if 'mrp' in data else item.mrp
-            item.sku = sku or item.sku
-            item.barcode = barcode or item.barcode
-            item.cost = cost if ('cost' in data or 'cost_price' in data) else item.cost
-            item.wrap = wrap or item.wrap
-            item.weight_division_factor = weight_division_factor if weight_division_factor_str else item.weight_division_factor
-            item.outer_case_quantity = outer_case_quantity if outer_case_quantity_str else item.outer_case_quantity
-            item.minimum_qty = minimum_qty if minimum_qty_str else item.minimum_qty
-            item.units = str(get_val('units', '')) or item.units
-            item.is_active = is_active
-            # Only update locks if provided
-            if 'price_locked' in data:
-                item.price_locked = price_locked_flag
-            if 'status_locked' in data:
-                item.status_locked = status_locked_flag
-            
-            # Recalculate converted_cost when weight_division_factor is updated
-            if weight_division_factor_str:
-                if weight_division_factor and weight_division_factor > 0:
-                    from decimal import Decimal
-                    item.converted_cost = Decimal(str(item.cost)) / Decimal(str(weight_division_factor))
-                else:
-                    item.converted_cost = None
-            
-            item.save()
         else:
-            # Item created with initial flags already set in get_or_create defaults
-            pass
+            converted_cost = None
+        
+        # Lookup/create, field update and CLS cascade commit together (one commit)
+        with transaction.atomic():
+            # Try to get existing item or create new one - WITH PLATFORM FILTER
+            item, created = Item.objects.get_or_create(
+                platform=platform,  # ✓ Add platform filter for platform isolation
+                item_code=item_code,
+                defaults={
+                    'platform': platform,  # ✓ Set platform in defaults
+                    'description': name,
+                    'pack_description': pack_description,
+                    'stock': stock_quantity,
+                    'selling_price': selling_price,
+                    'mrp': mrp,
+                    'sku': sku,
+                    'barcode': barcode,
+                    'cost': cost,
+                    'wrap': wrap,
+                    'weight_division_factor': weight_division_factor,
+                    'converted_cost': converted_cost,
+                    'outer_case_quantity': outer_case_quantity,
+                    'minimum_qty': minimum_qty,
+                    'units': units,
+                    'is_active': is_active,
+                    'price_locked': price_locked_flag,
+                    'status_locked': status_locked_flag,
+                    # stock_status is frontend-calculated field (not stored)
+                }
+            )
 
-        # Cascade CLS Status Lock to all ItemOutlet rows for this item when provided
-        if 'status_locked' in data:
-            try:
-                ItemOutlet.objects.filter(
-                    item=item,
-                    outlet__platforms=platform  # STRICT platform isolation
-                ).update(
-                    status_locked=status_locked_flag,
-                    is_active_in_outlet=(not status_locked_flag)
+            # Track original CLS status to determine cascade needs
+            original_status_locked = item.status_locked if not created else None
+
+            if not created:
+                # Snapshot editable fields so save() only writes the columns that changed
+                editable_fields = (
+                    'converted_cost', 'description', 'pack_description', 'stock', 'selling_price',
+                    'mrp', 'sku', 'barcode', 'cost', 'wrap', 'weight_division_factor',
+                    'outer_case_quantity', 'minimum_qty', 'units', 'is_active',
+                    'price_locked', 'status_locked',
                 )
-            except Exception as e:
-                # Do not fail save; report cascade issue in message for awareness
-                logger.warning(f"CLS status cascade failed for item {item.item_code}: {e}")
-        
+
+                def stored_value(field_name):
+                    # Compare decimals as the column stores them (request floats and the
+                    # unquantized converted_cost would otherwise always look changed)
+                    value = getattr(item, field_name)
+                    decimal_places = getattr(Item._meta.get_field(field_name), 'decimal_places', None)
+                    if value is None or decimal_places is None:
+                        return value
+                    return Decimal(str(value)).quantize(Decimal(1).scaleb(-decimal_places))
+
+                original_values = [stored_value(f) for f in editable_fields]
+
+                # Update existing item (single save, converted_cost included)
+                item.converted_cost = converted_cost
+                item.description = name or item.description
+                item.pack_description = pack_description or item.pack_description
+                item.stock = stock_quantity if 'stock' in data or 'stock_quantity' in data else item.stock
+                item.selling_price = selling_price if 'selling_price' in data else item.selling_price
+                item.mrp = mrp if 'mrp' in data else item.mrp
+                item.sku = sku or item.sku
+                item.barcode = barcode or item.barcode
+                item.cost = cost if ('cost' in data or 'cost_price' in data) else item.cost
+                item.wrap = wrap or item.wrap
+                item.weight_division_factor = weight_division_factor if weight_division_factor_str else item.weight_division_factor
+                item.outer_case_quantity = outer_case_quantity if outer_case_quantity_str else item.outer_case_quantity
+                item.minimum_qty = minimum_qty if minimum_qty_str else item.minimum_qty
+                item.units = units or item.units
+                item.is_active = is_active
+                # Only update locks if provided
+                if price_locked_given:
+                    item.price_locked = price_locked_flag
+                if status_locked_given:
+                    item.status_locked = status_locked_flag
+
+                # Recalculate converted_cost when weight_division_factor is updated
+                if weight_division_factor_str:
+                    if weight_division_factor and weight_division_factor > 0:
+                        item.converted_cost = Decimal(str(item.cost)) / Decimal(str(weight_division_factor))
+                    else:
+                        item.converted_cost = None
+
+                changed_fields = {
+                    f for f, old in zip(editable_fields, original_values) if stored_value(f) != old
+                }
+                if item.wrap in ALLOWED_WRAP_VALUES and item.weight_division_factor is None:
+                    # pre_save defaults the WDF to 1 for wrap 9900/10000 - let it run and persist
+                    changed_fields.add('weight_division_factor')
+                if changed_fields:
+                    # save() keeps the pre_save signals; update_fields narrows the UPDATE
+                    item.save(update_fields=[*changed_fields, 'updated_at'])
+            else:
+                # Item created with initial flags already set in get_or_create defaults
+                pass
+
+            # Cascade CLS Status Lock to all ItemOutlet rows for this item when provided
+            if status_locked_given:
+                try:
+                    # Savepoint: a failed cascade must not break the outer transaction
+                    with transaction.atomic():
+                        ItemOutlet.objects.filter(
+                            item=item,
+                            outlet__platforms=platform  # STRICT platform isolation
+                        ).update(
+                            status_locked=status_locked_flag,
+                            is_active_in_outlet=(not status_locked_flag),
+                            updated_at=timezone.now()  # .update() skips auto_now; partial exports key on it
+                        )
+                except Exception as e:
+                    # Do not fail save; report cascade issue in message for awareness
+                    logger.warning(f"CLS status cascade failed for item {item.item_code}: {e}")
+
         action = 'created' if created else 'updated'
         return JsonResponse({
             'success': True, 
@@ -3438,13 +3888,77 @@ def push_data_api(request):
         })
 
 
+def bulk_creation_row_errors(rows, first_row_num=2, limit=3):
+    """
+    Validate bulk item creation CSV rows column-wise with pandas.
+    
+    One vectorized pass per column instead of a Python loop per row. Checks and
+    their precedence per row: missing mandatory fields, then wrap, then numeric
+    formats (DECIMAL_PATTERN / INTEGER_PATTERN).
+    
+    Args:
+        rows (list): csv.DictReader rows
+        first_row_num (int): CSV line number of rows[0] (header is line 1)
+        limit (int): Maximum number of messages to return
+    
+    Returns:
+        list: "Row N: ..." messages for the first ``limit`` offending rows
+    """
+    import pandas as pd
+    
+    if limit <= 0 or not rows:
+        return []
+    
+    rows_df = pd.DataFrame.from_records(rows)
+
+    def csv_column(name):
+        if name in rows_df.columns:
+            return rows_df[name].fillna('').astype(str).str.strip()
+        return pd.Series('', index=rows_df.index, dtype=object)
+
+    mandatory_fields = ('wrap', 'item_code', 'description', 'units', 'sku', 'pack_description')
+    wrap_values = csv_column('wrap')
+    missing_df = pd.DataFrame(
+        {name: csv_column(name).eq('') for name in mandatory_fields},
+        index=rows_df.index
+    )
+    missing_any = missing_df.any(axis=1)
+    # Validate wrap strictly
+    bad_wrap = ~missing_any & ~wrap_values.isin(ALLOWED_WRAP_VALUES)
+    # Optional numeric validations
+    bad_numeric = pd.Series(False, index=rows_df.index)
+    for pattern, names in (
+        (DECIMAL_PATTERN, ('selling_price', 'cost', 'mrp', 'weight_division_factor')),
+        (INTEGER_PATTERN, ('stock', 'outer_case_quantity', 'minimum_qty')),
+    ):
+        for name in names:
+            if name not in rows_df.columns:
+                continue  # Optional column not in this file: nothing to parse
+            values = csv_column(name)
+            bad_numeric |= values.ne('') & ~values.str.match(pattern.pattern).fillna(False).astype(bool)
+    bad_numeric &= ~missing_any & ~bad_wrap
+
+    # Only the first few offending rows are formatted
+    row_errors = []
+    for pos in (missing_any | bad_wrap | bad_numeric).to_numpy().nonzero()[0][:limit]:
+        idx = int(pos) + first_row_num
+        if missing_any.iat[pos]:
+            missing = [name for name in mandatory_fields if missing_df[name].iat[pos]]
+            row_errors.append(f"Row {idx}: Missing mandatory fields: {', '.join(missing)}")
+        elif bad_wrap.iat[pos]:
+            row_errors.append(f"Row {idx}: Wrap must be 9900 or 10000 (got '{wrap_values.iat[pos]}')")
+        else:
+            row_errors.append(f"Row {idx}: Invalid numeric values in one of [selling_price, stock, cost, mrp, weight_division_factor, outer_case_quantity, minimum_qty]")
+    return row_errors
+
+
 @login_required
 def preview_csv_api(request):
     """
     API endpoint to preview CSV data before creating items or updating products
     """
     if request.method != 'POST':
-        return JsonResponse({'success': False, 'message': 'Only POST method allowed'})
+        return static_json_response(POST_ONLY_ERROR)
     
     try:
         platform = request.POST.get('platform')
@@ -3454,13 +3968,10 @@ def preview_csv_api(request):
         if not platform or not csv_file:
             return JsonResponse({'success': False, 'message': 'Platform and CSV file are required'})
         
-        # Process CSV file for preview
-        import csv
-        import io
-        
-        # Read CSV content with encoding fallback
-        csv_content, encoding_used = decode_csv_upload(csv_file)
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
+        # Stream-decode the upload (encoding detected from a sample) instead of
+        # holding the whole file as one string
+        csv_stream, encoding_used = open_csv_upload(csv_file)
+        csv_reader = csv.DictReader(csv_stream)
 
         preview_data = []
         errors = []
@@ -3469,86 +3980,60 @@ def preview_csv_api(request):
         # Header validation based on operation type
         if operation_type == 'product_update':
             # Product update: only these 5 fields allowed
-            required_headers = {'item_code', 'units'}
-            optional_headers = {'mrp', 'cost', 'stock'}
-            allowed_headers = required_headers | optional_headers
+            required_headers = PRODUCT_UPDATE_REQUIRED_HEADERS
+            allowed_headers = PRODUCT_UPDATE_ALLOWED_HEADERS
         else:
             # Bulk creation: requires all item creation fields
-            required_headers = {'wrap', 'item_code', 'description', 'units', 'sku', 'pack_description'}
-            optional_headers = {'barcode', 'mrp', 'selling_price', 'cost', 'stock', 'weight_division_factor', 'outer_case_quantity', 'minimum_qty'}
-            allowed_headers = required_headers | optional_headers
+            required_headers = BULK_CREATION_REQUIRED_HEADERS
+            allowed_headers = BULK_CREATION_ALLOWED_HEADERS
         
         # Filter out empty header fields (from trailing delimiters)
-        from .utils import normalize_csv_header
         header_fields = [normalize_csv_header(h) for h in (csv_reader.fieldnames or []) if h and h.strip()]
         if not header_fields:
             return JsonResponse({'success': False, 'message': 'CSV is missing header row. Include headers exactly as specified.'})
         if 'is_active' in header_fields:
             return JsonResponse({'success': False, 'message': "Column 'is_active' is not allowed in the CSV. Remove it and try again."})
-        missing_required = sorted(list(required_headers - set(header_fields)))
+        missing_required = sorted(required_headers.difference(header_fields))
         unknown_headers = sorted([h for h in header_fields if h and h not in allowed_headers])
         if missing_required:
             return JsonResponse({'success': False, 'message': f"Missing required columns: {', '.join(missing_required)}. The file was rejected."})
         if unknown_headers:
             return JsonResponse({'success': False, 'message': f"Unknown columns present: {', '.join(unknown_headers)}. Only defined headers are allowed."})
 
-        # Read CSV rows for preview
-        csv_rows = list(csv_reader)
+        # Key rows by the normalized header names validated above, so every cell is a
+        # single dict lookup (no 'Item Code' / 'item_code' fallbacks per row)
+        csv_reader.fieldnames = [normalize_csv_header(h) for h in csv_reader.fieldnames]
+
+        # Single streaming pass: keep the first 20 rows for the preview and count
+        # the rest; bulk creation validates in batches and stops at the first issues
+        
+        first_row = next(csv_reader, None)
         
         # Detect operation type based on CSV headers if not specified
-        if csv_rows and operation_type == 'bulk_creation':
-            headers = list(csv_rows[0].keys())
+        if first_row is not None and operation_type == 'bulk_creation':
+            headers = list(first_row.keys())
             # Check if this looks like a product update CSV (has Item Code, Units, MRP, Stock)
             product_update_headers = ['Item Code', 'Units', 'MRP', 'Stock']
             if all(header in headers for header in product_update_headers):
                 operation_type = 'product_update'
         
+        csv_rows = itertools.chain([first_row], csv_reader) if first_row is not None else iter(())
+        preview_rows = []
+        total_rows = 0
+        
         # Validate entire file rows strictly; reject on any missing required or invalid numeric
-        if operation_type == 'bulk_creation':
+        # (every non product_update upload is previewed with the bulk creation rules)
+        if operation_type != 'product_update':
             fatal_row_errors = []
-            for idx, r in enumerate(csv_rows, start=2):
-                m = {
-                    'wrap': r.get('wrap', '').strip(),
-                    'item_code': r.get('item_code', '').strip(),
-                    'description': r.get('description', '').strip(),
-                    'units': r.get('units', '').strip(),
-                    'sku': r.get('sku', '').strip(),
-                    'pack_description': r.get('pack_description', '').strip(),
-                }
-                missing = [k for k, v in m.items() if not v]
-                if missing:
-                    fatal_row_errors.append(f"Row {idx}: Missing mandatory fields: {', '.join(missing)}")
-                    continue
-                # Validate wrap strictly
-                if m['wrap'] not in ALLOWED_WRAP_VALUES:
-                    fatal_row_errors.append(f"Row {idx}: Wrap must be 9900 or 10000 (got '{m['wrap']}')")
-                    continue
-                # Optional numeric validations
-                try:
-                    sp = r.get('selling_price', '').strip()
-                    st = r.get('stock', '').strip()
-                    c = r.get('cost', '').strip()
-                    mval = r.get('mrp', '').strip()
-                    wdf = r.get('weight_division_factor', '').strip()
-                    ocq = r.get('outer_case_quantity', '').strip()
-                    minq = r.get('minimum_qty', '').strip()
-                    if sp:
-                        Decimal(sp)
-                    if st:
-                        int(st)
-                    if c:
-                        Decimal(c)
-                    if mval:
-                        Decimal(mval)
-                    if wdf:
-                        Decimal(wdf)
-                    if ocq:
-                        int(ocq)
-                    if minq:
-                        int(minq)
-                except (InvalidOperation, ValueError):
-                    fatal_row_errors.append(f"Row {idx}: Invalid numeric values in one of [selling_price, stock, cost, mrp, weight_division_factor, outer_case_quantity, minimum_qty]")
-                    continue
+            for batch in iter_csv_batches(csv_rows, 10000):
+                if len(preview_rows) < 20:
+                    preview_rows.extend(batch[:20 - len(preview_rows)])
+                fatal_row_errors.extend(bulk_creation_row_errors(
+                    batch, first_row_num=total_rows + 2, limit=3 - len(fatal_row_errors)
+                ))
+                total_rows += len(batch)
+                if len(fatal_row_errors) >= 3:
+                    break  # Enough to report; the file is rejected anyway
             if fatal_row_errors:
                 # Return a concise message; front-end shows only message when success=false
                 first = fatal_row_errors[:3]
@@ -3556,16 +4041,54 @@ def preview_csv_api(request):
                     'success': False,
                     'message': 'CSV validation failed; the file was rejected. First issues: ' + ' | '.join(first)
                 })
+        else:
+            for row in csv_rows:
+                if total_rows < 20:
+                    preview_rows.append(row)
+                total_rows += 1
+
+        # Trim every preview cell once (short rows' missing cells become ''), so the
+        # checks below read values directly instead of calling .strip() per access
+        preview_rows = [
+            {key: (value or '').strip() for key, value in row.items() if key is not None}
+            for row in preview_rows
+        ]
 
-        for row_num, row in enumerate(csv_rows[:20], start=2):  # Preview first 20 rows
+        # Item existence for the preview rows in one query instead of one per row
+        existing_pairs = set()
+        if operation_type == 'product_update':
+            preview_codes = {
+                row.get('item_code', '') for row in preview_rows
+            }
+            preview_codes.discard('')
+            if preview_codes:
+                existing_pairs = set(Item.objects.filter(
+                    item_code__in=preview_codes, platform=platform
+                ).values_list('item_code', 'units'))
+        
+        # Bulk creation duplicate check: first item (Item's default item_code ordering, as .first() used) per SKU and
+        # which of those are already linked on this platform - two queries in total
+        sku_item_ids = {}
+        linked_item_ids = set()
+        if operation_type != 'product_update' and platform in VALID_PLATFORMS:
+            preview_skus = {row.get('sku', '') for row in preview_rows}
+            for sku, item_id in Item.objects.filter(sku__in=preview_skus).order_by('item_code', 'pk').values_list('sku', 'id'):
+                sku_item_ids.setdefault(sku, item_id)
+            if sku_item_ids:
+                linked_item_ids = set(ItemOutlet.objects.filter(
+                    item_id__in=sku_item_ids.values(),
+                    outlet__platforms=platform  # STRICT isolation
+                ).values_list('item_id', flat=True))
+
+        for row_num, row in enumerate(preview_rows, start=2):  # Preview first 20 rows
             try:
                 if operation_type == 'product_update':
                     # Product Update CSV validation
-                    item_code = row.get('Item Code', row.get('item_code', '')).strip()
-                    units = row.get('Units', row.get('units', '')).strip()
-                    mrp_str = row.get('MRP', row.get('mrp', '')).strip()
-                    cost_str = row.get('Cost', row.get('cost', '')).strip()
-                    stock_str = row.get('Stock', row.get('stock', '')).strip()
+                    item_code = row.get('item_code', '')
+                    units = row.get('units', '')
+                    mrp_str = row.get('mrp', '')
+                    cost_str = row.get('cost', '')
+                    stock_str = row.get('stock', '')
                     
                     # Validate mandatory fields for product update (only item_code and units required)
                     row_status = 'valid'
@@ -3594,9 +4117,8 @@ def preview_csv_api(request):
                         row_status = 'error'
                     
                     # Check if item exists for product update - PLATFORM ISOLATED
-                    from .models import Item
                     if item_code and units:
-                        if not Item.objects.filter(item_code=item_code, units=units, platform=platform).exists():
+                        if (item_code, units) not in existing_pairs:
                             row_errors.append(f"Item '{item_code}' ({units}) not found in {platform.title()} platform")
                             row_status = 'error'
                     
@@ -3615,27 +4137,27 @@ def preview_csv_api(request):
                     
                 else:
                     # Bulk Item Creation CSV validation (original logic)
-                    base_item_code = row.get('item_code', '').strip()
-                    base_sku = row.get('sku', '').strip()
+                    base_item_code = row.get('item_code', '')
+                    base_sku = row.get('sku', '')
                     
                     # Validate mandatory fields
                     mandatory_fields = {
-                        'wrap': row.get('wrap', '').strip(),
+                        'wrap': row.get('wrap', ''),
                         'item_code': base_item_code,
-                        'description': row.get('description', '').strip(),
-                        'units': row.get('units', '').strip(),
+                        'description': row.get('description', ''),
+                        'units': row.get('units', ''),
                         'sku': base_sku,
-                        'pack_description': row.get('pack_description', '').strip()
+                        'pack_description': row.get('pack_description', '')
                     }
                     
                     # Handle optional fields
-                    selling_price_str = row.get('selling_price', '').strip()
-                    stock_str = row.get('stock', '').strip()
-                    cost_str = row.get('cost', '').strip()
-                    mrp_str = row.get('mrp', '').strip()
-                    wdf_str = row.get('weight_division_factor', '').strip()
-                    ocq_str = row.get('outer_case_quantity', '').strip()
-                    minq_str = row.get('minimum_qty', '').strip()
+                    selling_price_str = row.get('selling_price', '')
+                    stock_str = row.get('stock', '')
+                    cost_str = row.get('cost', '')
+                    mrp_str = row.get('mrp', '')
+                    wdf_str = row.get('weight_division_factor', '')
+                    ocq_str = row.get('outer_case_quantity', '')
+                    minq_str = row.get('minimum_qty', '')
                     
                     # Check for missing mandatory fields
                     missing_fields = [field for field, value in mandatory_fields.items() if not value]
@@ -3646,38 +4168,25 @@ def preview_csv_api(request):
                         row_errors.append(f"Missing: {', '.join(missing_fields)}")
                         row_status = 'error'
                     
-                    # Validate numeric fields (optional fields are now weight_division_factor, outer_case_quantity, minimum_qty)
-                    try:
-                        selling_price = float(selling_price_str) if selling_price_str else 0.0
-                        stock = int(stock_str) if stock_str else 0
-                        cost = float(cost_str) if cost_str else 0.0
-                        mrp = float(mrp_str) if mrp_str else 0.0
-                        wdf = float(wdf_str) if wdf_str else None
-                        ocq = int(ocq_str) if ocq_str else None
-                        minq = int(minq_str) if minq_str else None
-                    except ValueError:
-                        row_errors.append("Invalid numeric values in one of [selling_price, stock, cost, mrp, weight_division_factor, outer_case_quantity, minimum_qty]")
-                        row_status = 'error'
-                        selling_price = 0.0
-                        stock = 0
-                        cost = 0.0
-                        mrp = 0.0
-                        wdf = None
-                        ocq = None
-                        minq = None
+                    # Numeric formats were already checked column-wise for the whole file by
+                    # bulk_creation_row_errors() (the file is rejected otherwise), so these
+                    # conversions cannot fail and need no per-row try/except
+                    selling_price = float(selling_price_str) if selling_price_str else 0.0
+                    stock = int(stock_str) if stock_str else 0
+                    cost = float(cost_str) if cost_str else 0.0
+                    mrp = float(mrp_str) if mrp_str else 0.0
+                    wdf = float(wdf_str) if wdf_str else None
+                    ocq = int(ocq_str) if ocq_str else None
+                    minq = int(minq_str) if minq_str else None
                     
                     # Handle optional fields
-                    barcode = row.get('barcode', '').strip()
+                    barcode = row.get('barcode', '')
                     
                     # Check if item already exists and apply platform-specific duplicate handling
-                    from .models import Item, ItemOutlet
-                    existing_item = Item.objects.filter(sku=base_sku).first()
-                    if existing_item:
-                        if platform in ('pasons', 'talabat'):
-                            linked = ItemOutlet.objects.filter(
-                                item=existing_item,
-                                outlet__platforms=platform  # STRICT isolation
-                            ).exists()
+                    existing_item_id = sku_item_ids.get(base_sku)
+                    if existing_item_id:
+                        if platform in VALID_PLATFORMS:
+                            linked = existing_item_id in linked_item_ids
                             if linked:
                                 # Duplicate within selected platform: mark as row error
                                 row_errors.append(
@@ -3716,23 +4225,21 @@ def preview_csv_api(request):
             except Exception as e:
                 errors.append(f"Row {row_num}: Error processing - {str(e)}")
         
-        # Get platform outlets info
-        from .models import Outlet
-        from django.db import models
-        outlets = Outlet.objects.filter(
+        # Get platform outlets info (plain dicts, no Outlet instances)
+        outlets = list(Outlet.objects.filter(
             is_active=True,
             platforms=platform  # STRICT isolation
-        )
+        ).values('name', 'id'))
         
         return JsonResponse({
             'success': True,
             'preview_data': preview_data,
-            'total_rows': len(csv_rows),
+            'total_rows': total_rows,
             'preview_rows': len(preview_data),
             'errors': errors,
             'warnings': warnings,
             'platform': platform,
-            'outlets': [{'name': outlet.name, 'id': outlet.id} for outlet in outlets],
+            'outlets': outlets,
             'encoding_used': encoding_used
         })
         
@@ -3740,6 +4247,49 @@ def preview_csv_api(request):
         return JsonResponse({'success': False, 'message': f'Error processing CSV: {str(e)}'})
 
 
+def item_ids_for_combination_keys(combination_keys, platform=None, chunk_size=500):
+    """
+    Resolve item_code|description|sku keys from the deletion UI to Item ids.
+    
+    Candidates are fetched with an IN over the lowercased item codes (served by the
+    functional item_code index when a platform is given) and matched against the
+    keys case-insensitively in Python, instead of OR-ing one three-column iexact
+    clause per key into a single WHERE.
+    
+    Args:
+        combination_keys (list): 'item_code|description|sku' strings; malformed ones are skipped
+        platform (str): Restrict to this platform ('pasons'/'talabat'), else all
+        chunk_size (int): item codes per IN query
+    
+    Returns:
+        list: matching Item ids
+    """
+    from html import unescape as html_unescape
+    
+    wanted_keys = set()
+    for combination_key in combination_keys:
+        parts = combination_key.split('|')
+        if len(parts) != 3:
+            continue
+        item_code, description, sku = parts
+        # Unescape HTML entities in description (e.g., &#x27; -> ')
+        description = html_unescape(description)
+        wanted_keys.add((item_code.lower(), description.lower(), sku.lower()))
+    
+    item_codes = list({key[0] for key in wanted_keys})
+    matched_ids = []
+    for i in range(0, len(item_codes), chunk_size):
+        items_qs = Item.objects.filter(item_code__lower__in=item_codes[i:i + chunk_size])
+        if platform in VALID_PLATFORMS:
+            items_qs = items_qs.filter(platform=platform)
+        for item_id, item_code, description, sku in items_qs.order_by().values_list(
+            'id', 'item_code', 'description', 'sku'
+        ):
+            if (item_code.lower(), description.lower(), sku.lower()) in wanted_keys:
+                matched_ids.append(item_id)
+    return matched_ids
+
+
 @login_required
 @rate_limit(max_requests=10, time_window_seconds=60)  # 10 requests per minute
 def delete_items_api(request):
@@ -3747,22 +4297,15 @@ def delete_items_api(request):
     API endpoint for deleting items (both bulk and single deletion)
     """
     if request.method != 'POST':
-        return JsonResponse({'success': False, 'message': 'Only POST method allowed'})
+        return static_json_response(POST_ONLY_ERROR)
     
     try:
-        import json
-        from html import unescape as html_unescape
-        from .models import Item
-        from django.db import models
-        
         data = json.loads(request.body)
         combination_keys = data.get('combination_keys', [])  # item_code|description|sku
         deletion_type = data.get('deletion_type', 'single')
         delete_scope = data.get('delete_scope', 'selected')  # selected | current_page | filtered | all
         platform = (data.get('platform') or '').strip()
 
-        from django.db.models import Q, Count
-
         # Build queryset to delete based on scope
         items_to_delete = Item.objects.none()
         scope_description = ''
@@ -3771,50 +4314,23 @@ def delete_items_api(request):
             if not combination_keys:
                 return JsonResponse({'success': False, 'message': 'No items selected for deletion'})
 
-            query = Q()
-            for combination_key in combination_keys:
-                parts = combination_key.split('|')
-                if len(parts) != 3:
-                    continue
-                item_code, description, sku = parts
-                # Unescape HTML entities in description (e.g., &#x27; -> ')
-                description = html_unescape(description)
-                query |= Q(
-                    item_code__iexact=item_code,
-                    description__iexact=description,
-                    sku__iexact=sku
-                )
-            items_to_delete = Item.objects.filter(query)
-            if platform in ('pasons', 'talabat'):
-                items_to_delete = items_to_delete.filter(platform=platform)
+            items_to_delete = Item.objects.filter(
+                id__in=item_ids_for_combination_keys(combination_keys, platform)
+            )
             scope_description = f"selected ({len(combination_keys)})"
 
         elif delete_scope == 'current_page':
             # Expect combination_keys of the currently displayed items (100/200)
             if not combination_keys:
                 return JsonResponse({'success': False, 'message': 'No page items provided for deletion'})
-            query = Q()
-            for combination_key in combination_keys:
-                parts = combination_key.split('|')
-                if len(parts) != 3:
-                    continue
-                item_code, description, sku = parts
-                # Unescape HTML entities in description (e.g., &#x27; -> ')
-                description = html_unescape(description)
-                query |= Q(
-                    item_code__iexact=item_code,
-                    description__iexact=description,
-                    sku__iexact=sku
-                )
-            items_to_delete = Item.objects.filter(query)
-            if platform in ('pasons', 'talabat'):
-                items_to_delete = items_to_delete.filter(platform=platform)
+            items_to_delete = Item.objects.filter(
+                id__in=item_ids_for_combination_keys(combination_keys, platform)
+            )
             scope_description = f"current_page ({len(combination_keys)})"
 
         elif delete_scope == 'filtered':
             # Filters payload matching search_product_api params
             filters = data.get('filters', {})
-            platform = (data.get('platform') or '').strip()
             include_inactive = (data.get('include_inactive') or False) in (True, '1', 'true', 'True')
             item_code = (filters.get('item_code') or '').strip()
             description = (filters.get('description') or '').strip()
@@ -3826,7 +4342,7 @@ def delete_items_api(request):
             stock_max = (filters.get('stock_max') or '').strip()
 
             qs = Item.objects.all() if include_inactive else Item.objects.filter(is_active=True)
-            if platform in ('pasons', 'talabat'):
+            if platform in VALID_PLATFORMS:
                 qs = qs.filter(platform=platform)
             if item_code:
                 qs = qs.filter(item_code__icontains=item_code)
@@ -3867,8 +4383,7 @@ def delete_items_api(request):
             if not (confirm_all and confirm_text.upper() == 'DELETE ALL'):
                 return JsonResponse({'success': False, 'message': 'Full delete requires confirmation: type "DELETE ALL"'})
             # If a platform is provided, limit to items linked to that platform; otherwise entire database
-            if (data.get('platform') or '').strip() in ('pasons', 'talabat'):
-                platform = (data.get('platform') or '').strip()
+            if platform in VALID_PLATFORMS:
                 items_to_delete = Item.objects.filter(platform=platform)
                 scope_description = f"entire_database_for_platform_{platform}"
             else:
@@ -3878,38 +4393,60 @@ def delete_items_api(request):
         else:
             return JsonResponse({'success': False, 'message': 'Invalid delete scope'})
 
-        if not items_to_delete.exists():
-            return JsonResponse({'success': False, 'message': 'No items found for deletion'})
+        if delete_scope == 'all':
+            # Platform/table wipe: keep the scope as one subquery instead of pulling
+            # every id into Python. No exists() probe - the delete counts below
+            # tell us when the scope was empty.
+            id_batches = [items_to_delete.order_by().values('id')]
+        else:
+            # Materialize the target ids once; every step below reuses them instead of
+            # re-running the scope query as a subquery. Id chunks keep each IN list
+            # within the database's parameter limit.
+            item_ids = list(items_to_delete.order_by().values_list('id', flat=True))
+            if not item_ids:
+                return JsonResponse({'success': False, 'message': 'No items found for deletion'})
+            chunk_size = 500
+            id_batches = [item_ids[i:i + chunk_size] for i in range(0, len(item_ids), chunk_size)]
 
         # For platform-safe deletion: first remove ItemOutlet associations for selected platform,
         # then delete Item objects that become orphaned (no outlets remain)
-        # Collect brief audit info (limit to first 50 to avoid log blow-up)
-        deleted_items_info = []
-        for item in items_to_delete[:50]:
-            deleted_items_info.append({
-                'id': item.id,
-                'item_code': item.item_code,
-                'description': item.description,
-                'sku': item.sku
-            })
-
-        # Delete associations specific to selected platform if provided; otherwise, delete all associations
-        if platform in ('pasons', 'talabat'):
-            associations_qs = ItemOutlet.objects.filter(
-                item__in=items_to_delete,
-                outlet__platforms=platform
-            )
-        else:
-            associations_qs = ItemOutlet.objects.filter(item__in=items_to_delete)
-
-        associations_count = associations_qs.count()
-        associations_qs.delete()
+        # Collect brief audit info (limit to first 50 to avoid log blow-up);
+        # plain dicts of the four audited columns, no model instances
+        deleted_items_info = list(
+            Item.objects.filter(id__in=id_batches[0]).values('id', 'item_code', 'description', 'sku')[:50]
+        )
 
-        # Now delete items that are no longer associated with any outlet
-        orphan_items_qs = Item.objects.filter(id__in=items_to_delete.values_list('id', flat=True))\
-            .annotate(outlet_count=Count('item_outlets')).filter(outlet_count=0)
-        items_deleted_count = orphan_items_qs.count()
-        orphan_items_qs.delete()
+        associations_count = 0
+        items_deleted_count = 0
+        # One transaction: both deletes see the same row set and a failure part-way
+        # through leaves no half-deleted selection behind
+        with transaction.atomic():
+            for chunk_ids in id_batches:
+
+                # Delete associations specific to selected platform if provided; otherwise, delete all associations
+                if platform in VALID_PLATFORMS:
+                    associations_qs = ItemOutlet.objects.filter(
+                        item_id__in=chunk_ids,
+                        outlet__platforms=platform
+                    )
+                else:
+                    associations_qs = ItemOutlet.objects.filter(item_id__in=chunk_ids)
+
+                # delete() reports per-model row counts - no separate COUNT query. Use the
+                # model's own entry: the total also includes any cascaded related rows.
+                _, deleted_per_model = associations_qs.delete()
+                associations_count += deleted_per_model.get(ItemOutlet._meta.label, 0)
+
+                # Now delete items that are no longer associated with any outlet
+                # (NOT EXISTS stops at the first link; no LEFT JOIN + GROUP BY count).
+                # Orphans have no ItemOutlet rows left to cascade to and Item has no
+                # delete signals, so one raw DELETE replaces the collector's PK fetch.
+                orphan_items_qs = Item.objects.filter(id__in=chunk_ids)\
+                    .filter(~Exists(ItemOutlet.objects.filter(item_id=OuterRef('pk'))))
+                items_deleted_count += orphan_items_qs._raw_delete(orphan_items_qs.db)
+
+        if delete_scope == 'all' and not associations_count and not items_deleted_count:
+            return JsonResponse({'success': False, 'message': 'No items found for deletion'})
 
         logger.info(
             f"User {request.user.username} deletion via {deletion_type} ({scope_description}) | Associations removed: {associations_count}, Items deleted: {items_deleted_count}"
@@ -3962,7 +4499,7 @@ def export_feed_api(request):
     - First export: Always treated as full export
     """
     import csv
-    from django.http import HttpResponse
+    from django.http import FileResponse
     from django.utils import timezone
     from .export_service import ExportService
     
@@ -3977,7 +4514,7 @@ def export_feed_api(request):
         logger.warning(f"Deprecated parameter 'exclude_promotions' received in shop integration export for outlet {outlet_id}. Parameter ignored - all items will be exported.")
     
     # VALIDATION 1: Platform
-    if platform not in ('pasons', 'talabat'):
+    if platform not in VALID_PLATFORMS:
         logger.warning(f"Invalid platform: {platform}")
         return JsonResponse({
             'success': False,
@@ -4064,66 +4601,36 @@ def export_feed_api(request):
             if platform == 'talabat':
                 # Talabat format: barcode, sku, reason, start_date, end_date, campaign_status, discounted_price, max_no_of_orders, price, active
                 file_writer.writerow(['barcode', 'sku', 'reason', 'start_date', 'end_date', 'campaign_status', 'discounted_price', 'max_no_of_orders', 'price', 'active'])
-                for row in export_data:
-                    file_writer.writerow([
-                        row['barcode'],           # barcode
-                        row['sku'],               # sku
-                        '',                       # reason (placeholder)
-                        '',                       # start_date (placeholder)
-                        '',                       # end_date (placeholder)
-                        '',                       # campaign_status (placeholder)
-                        '',                       # discounted_price (placeholder)
-                        '',                       # max_no_of_orders (placeholder)
-                        row['selling_price'],     # price
-                        row['stock_status']       # active (stock_status)
-                    ])
+                # writerows() drives the loop in C; the generator only projects columns
+                file_writer.writerows((
+                    row['barcode'],           # barcode
+                    row['sku'],               # sku
+                    '',                       # reason (placeholder)
+                    '',                       # start_date (placeholder)
+                    '',                       # end_date (placeholder)
+                    '',                       # campaign_status (placeholder)
+                    '',                       # discounted_price (placeholder)
+                    '',                       # max_no_of_orders (placeholder)
+                    row['selling_price'],     # price
+                    row['stock_status']       # active (stock_status)
+                ) for row in export_data)
             else:
                 # Pasons format: sku, selling_price, stock_status, availability_status
                 file_writer.writerow(['sku', 'selling_price', 'stock_status', 'availability_status'])
-                for row in export_data:
-                    file_writer.writerow([
-                        row['sku'],
-                        row['selling_price'],
-                        row['stock_status'],
-                        row['stock_status']
-                    ])
+                file_writer.writerows(
+                    (row['sku'], row['selling_price'], row['stock_status'], row['stock_status'])
+                    for row in export_data
+                )
         
         # Update ExportHistory with filename
         export_history.file_name = filename
         export_history.save(update_fields=['file_name'])
         
-        # Create CSV response for immediate download using same format
-        response = HttpResponse(content_type='text/csv')
+        # Stream the file just written for the immediate download (same bytes as a
+        # re-download) instead of building a second copy of the CSV in memory
+        response = FileResponse(open(file_path, 'rb'), content_type='text/csv')
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         
-        writer = csv.writer(response)  # Use comma delimiter for Excel compatibility
-        if platform == 'talabat':
-            # Talabat format
-            writer.writerow(['barcode', 'sku', 'reason', 'start_date', 'end_date', 'campaign_status', 'discounted_price', 'max_no_of_orders', 'price', 'active'])
-            for row in export_data:
-                writer.writerow([
-                    row['barcode'],
-                    row['sku'],
-                    '',  # reason
-                    '',  # start_date
-                    '',  # end_date
-                    '',  # campaign_status
-                    '',  # discounted_price
-                    '',  # max_no_of_orders
-                    row['selling_price'],
-                    row['stock_status']
-                ])
-        else:
-            # Pasons format
-            writer.writerow(['sku', 'selling_price', 'stock_status', 'availability_status'])
-            for row in export_data:
-                writer.writerow([
-                    row['sku'],
-                    row['selling_price'],
-                    row['stock_status'],
-                    row['stock_status']
-                ])
-        
         logger.info(
             f"Export successful: {outlet.name} ({platform}) - "
             f"{export_history.get_export_type_display()} - "
@@ -4273,13 +4780,11 @@ def erp_export_api(request):
                     item_outlets = item_outlets.filter(id__in=changed_items)
                     logger.info(f"Partial export: {len(changed_items)} items have price changes")
                 else:
-                    # No changes found, return empty
+                    # No changes found, return empty (changed_items already answers
+                    # "anything to export?" - no exists() probe needed)
                     logger.info("Partial export: No items with price changes found")
-                    item_outlets = item_outlets.none()
-                
-                # If no changes found, return empty queryset
-                if not item_outlets.exists():
                     logger.info("Partial export: No changes detected since last export")
+                    item_outlets = item_outlets.none()
             else:
                 # No previous export found - treat as full export
                 logger.info("Partial export: No previous export found, performing full export")
@@ -4590,7 +5095,7 @@ def export_platform_items(request):
     
     platform = request.POST.get('platform', '').strip()
     
-    if not platform or platform not in ('pasons', 'talabat'):
+    if not platform or platform not in VALID_PLATFORMS:
         messages.error(request, 'Please select a valid platform.')
         return redirect('integration:reports')
     
@@ -4666,7 +5171,7 @@ def export_outlet_items(request):
     platform = request.POST.get('platform', '').strip()
     outlet_id = request.POST.get('outlet', '').strip()
     
-    if not platform or platform not in ('pasons', 'talabat'):
+    if not platform or platform not in VALID_PLATFORMS:
         messages.error(request, 'Please select a valid platform.')
         return redirect('integration:reports')
     
@@ -4747,22 +5252,21 @@ def report_stats_api(request):
     from .models import Item, Outlet, ItemOutlet
     
     try:
-        # Platform-specific item counts
-        pasons_items = Item.objects.filter(platform='pasons').count()
-        talabat_items = Item.objects.filter(platform='talabat').count()
+        # Platform-specific item counts (one aggregate query)
+        item_counts = Item.objects.aggregate(
+            pasons_items=Count('pk', filter=Q(platform='pasons')),
+            talabat_items=Count('pk', filter=Q(platform='talabat')),
+        )
         
-        # Platform-specific outlet counts
-        pasons_outlets = Outlet.objects.filter(platforms='pasons', is_active=True).count()
-        talabat_outlets = Outlet.objects.filter(platforms='talabat', is_active=True).count()
+        # Platform-specific outlet counts (one aggregate query)
+        outlet_counts = Outlet.objects.filter(is_active=True).aggregate(
+            pasons_outlets=Count('pk', filter=Q(platforms='pasons')),
+            talabat_outlets=Count('pk', filter=Q(platforms='talabat')),
+        )
         
         return JsonResponse({
             'success': True,
-            'stats': {
-                'pasons_items': pasons_items,
-                'talabat_items': talabat_items,
-                'pasons_outlets': pasons_outlets,
-                'talabat_outlets': talabat_outlets,
-            }
+            'stats': {**item_counts, **outlet_counts}
         })
     except Exception as e:
         return JsonResponse({
@@ -4874,7 +5378,7 @@ def report_data_api(request):
         else:
             # All items or platform-specific report - PLATFORM ISOLATION REQUIRED
             # CRITICAL: Always require platform filter to prevent data leakage
-            if not platform or platform not in ('pasons', 'talabat'):
+            if not platform or platform not in VALID_PLATFORMS:
                 return JsonResponse({
                     'success': False, 
                     'message': 'Platform filter is required. Please select Pasons or Talabat platform.'
@@ -4992,38 +5496,34 @@ def locked_products_data_api(request):
         outlet_id = request.GET.get('outlet', '').strip()
         
         # Validate platform
-        if not platform or platform not in ('pasons', 'talabat'):
+        if not platform or platform not in VALID_PLATFORMS:
             return JsonResponse({
                 'success': False, 
                 'message': 'Platform filter is required. Please select Pasons or Talabat platform.'
             })
         
         # Validate lock type
-        if not lock_type or lock_type not in ('cls_price', 'cls_status', 'bls_price', 'bls_status'):
+        if not lock_type or lock_type not in LOCKED_PRODUCT_LOCK_TYPES:
             return JsonResponse({
                 'success': False, 
                 'message': 'Lock type is required. Please select a valid lock type.'
             })
+        lock_field, lock_display, _ = LOCKED_PRODUCT_LOCK_TYPES[lock_type]
         
         headers = ['#', 'Item Code', 'Units', 'Description', 'Selling Price', 'Pack Description', 'Lock Type', 'Lock Level', 'Status']
         rows = []
         
+        # Only the columns the report rows read
+        item_fields = ('item_code', 'units', 'description', 'selling_price', 'pack_description', 'is_active')
+        io_fields = ('outlet_selling_price', 'is_active_in_outlet', *(f'item__{name}' for name in item_fields))
+        
         if lock_type.startswith('cls'):
             # Central Locking System (CLS) - affects all outlets for the platform
-            if lock_type == 'cls_price':
-                items = Item.objects.filter(
-                    platform=platform,
-                    price_locked=True,
-                    is_active=True
-                ).order_by('item_code')
-                lock_display = 'CLS Price Lock'
-            else:  # cls_status
-                items = Item.objects.filter(
-                    platform=platform,
-                    status_locked=True,
-                    is_active=True
-                ).order_by('item_code')
-                lock_display = 'CLS Status Lock'
+            items = Item.objects.filter(
+                platform=platform,
+                is_active=True,
+                **{lock_field: True}
+            ).only(*item_fields).order_by('item_code')
             
             for idx, item in enumerate(items, 1):
                 rows.append([
@@ -5048,42 +5548,35 @@ def locked_products_data_api(request):
             
             # Handle "all" outlets option
             if outlet_id == 'all':
-                # Get all outlets for this platform
-                outlets = Outlet.objects.filter(platforms=platform, is_active=True).order_by('name')
-                if not outlets.exists():
+                # Get all outlets for this platform; names are looked up from this
+                # map per row instead of hydrating an Outlet for every lock
+                outlet_names = dict(
+                    Outlet.objects.filter(platforms=platform, is_active=True).values_list('id', 'name')
+                )
+                if not outlet_names:
                     return JsonResponse({
                         'success': False, 
                         'message': f'No active outlets found for {platform} platform.'
                     })
                 
                 # Debug logging
-                logger.info(f"BLS All Outlets Debug - Platform: {platform}, Outlets found: {outlets.count()}")
+                logger.info(f"BLS All Outlets Debug - Platform: {platform}, Outlets found: {len(outlet_names)}")
                 
                 # Add outlet name to headers
                 headers.append('Outlet')
                 
-                if lock_type == 'bls_price':
-                    item_outlets = ItemOutlet.objects.filter(
-                        outlet__in=outlets,
-                        item__platform=platform,
-                        price_locked=True
-                        # Removed is_active_in_outlet=True - we want to see ALL locked items
-                    ).select_related('item', 'outlet').order_by('item__item_code', 'outlet__name')
-                    lock_display = 'BLS Price Lock'
-                    logger.info(f"BLS Price Locks found: {item_outlets.count()}")
-                else:  # bls_status
-                    item_outlets = ItemOutlet.objects.filter(
-                        outlet__in=outlets,
-                        item__platform=platform,
-                        status_locked=True
-                        # Removed is_active_in_outlet=True - we want to see ALL locked items
-                    ).select_related('item', 'outlet').order_by('item__item_code', 'outlet__name')
-                    lock_display = 'BLS Status Lock'
-                    logger.info(f"BLS Status Locks found: {item_outlets.count()}")
+                item_outlets = ItemOutlet.objects.filter(
+                    outlet__platforms=platform,
+                    outlet__is_active=True,
+                    item__platform=platform,
+                    **{lock_field: True}
+                    # Removed is_active_in_outlet=True - we want to see ALL locked items
+                ).select_related('item').only(*io_fields, 'outlet_id').order_by('item__item_code', 'outlet__name')
                 
                 for idx, io in enumerate(item_outlets, 1):
                     item = io.item
                     selling_price = io.outlet_selling_price or item.selling_price
+                    io_outlet_name = outlet_names[io.outlet_id]
                     
                     rows.append([
                         idx,
@@ -5093,11 +5586,14 @@ def locked_products_data_api(request):
                         float(selling_price) if selling_price else '-',
                         item.pack_description[:30] + '...' if item.pack_description and len(item.pack_description) > 30 else (item.pack_description or '-'),
                         lock_display,
-                        f'Branch ({io.outlet.name})',
-                        io.outlet.name,
+                        f'Branch ({io_outlet_name})',
+                        io_outlet_name,
                         'Active' if io.is_active_in_outlet else 'Disabled'
                     ])
                 
+                # Count from the fetched rows instead of a second COUNT(*)
+                logger.info(f"{lock_display}s found: {len(rows)}")
+                
                 outlet_name = f'All {platform.title()} Outlets'
             else:
                 # Single outlet BLS report
@@ -5112,22 +5608,12 @@ def locked_products_data_api(request):
                 # Add outlet name to headers
                 headers.append('Outlet')
                 
-                if lock_type == 'bls_price':
-                    item_outlets = ItemOutlet.objects.filter(
-                        outlet=outlet,
-                        item__platform=platform,
-                        price_locked=True
-                        # Removed is_active_in_outlet=True - we want to see ALL locked items
-                    ).select_related('item').order_by('item__item_code')
-                    lock_display = 'BLS Price Lock'
-                else:  # bls_status
-                    item_outlets = ItemOutlet.objects.filter(
-                        outlet=outlet,
-                        item__platform=platform,
-                        status_locked=True
-                        # Removed is_active_in_outlet=True - we want to see ALL locked items
-                    ).select_related('item').order_by('item__item_code')
-                    lock_display = 'BLS Status Lock'
+                item_outlets = ItemOutlet.objects.filter(
+                    outlet=outlet,
+                    item__platform=platform,
+                    **{lock_field: True}
+                    # Removed is_active_in_outlet=True - we want to see ALL locked items
+                ).select_related('item').only(*io_fields).order_by('item__item_code')
                 
                 for idx, io in enumerate(item_outlets, 1):
                     item = io.item
@@ -5192,25 +5678,25 @@ def export_locked_products_api(request):
         export_format = request.POST.get('format', 'csv').strip()
         
         # Validate platform
-        if not platform or platform not in ('pasons', 'talabat'):
+        if not platform or platform not in VALID_PLATFORMS:
             return JsonResponse({'success': False, 'message': 'Valid platform is required'})
         
         # Validate lock type
-        if not lock_type or lock_type not in ('cls_price', 'cls_status', 'bls_price', 'bls_status'):
+        if not lock_type or lock_type not in LOCKED_PRODUCT_LOCK_TYPES:
             return JsonResponse({'success': False, 'message': 'Valid lock type is required'})
+        lock_field, lock_display, lock_type_name = LOCKED_PRODUCT_LOCK_TYPES[lock_type]
         
         # Generate filename
         timestamp = timezone.localtime().strftime('%Y-%m-%d-%H%M%S')
-        lock_type_name = {
-            'cls_price': 'CLS-Price-Locked',
-            'cls_status': 'CLS-Status-Locked',
-            'bls_price': 'BLS-Price-Locked',
-            'bls_status': 'BLS-Status-Locked'
-        }[lock_type]
         
         platform_name = platform.title()
         filename = f'{platform_name}-{lock_type_name}-Products-{timestamp}'
         
+        # Rows are only written out, so read plain tuples instead of model instances
+        cls_columns = ('item_code', 'units', 'description', 'selling_price', 'pack_description')
+        bls_columns = ('item__item_code', 'item__units', 'item__description', 'outlet_selling_price',
+                       'item__selling_price', 'item__pack_description')
+        
         if export_format == 'excel':
             # Excel export
             import openpyxl
@@ -5232,19 +5718,14 @@ def export_locked_products_api(request):
             row_num = 2
             if lock_type.startswith('cls'):
                 # CLS data
-                if lock_type == 'cls_price':
-                    items = Item.objects.filter(platform=platform, price_locked=True, is_active=True).order_by('item_code')
-                    lock_display = 'CLS Price Lock'
-                else:
-                    items = Item.objects.filter(platform=platform, status_locked=True, is_active=True).order_by('item_code')
-                    lock_display = 'CLS Status Lock'
+                items = Item.objects.filter(platform=platform, is_active=True, **{lock_field: True}).order_by('item_code')
                 
-                for item in items:
-                    ws.cell(row=row_num, column=1, value=item.item_code)
-                    ws.cell(row=row_num, column=2, value=item.units)
-                    ws.cell(row=row_num, column=3, value=item.description)
-                    ws.cell(row=row_num, column=4, value=float(item.selling_price) if item.selling_price else 0)
-                    ws.cell(row=row_num, column=5, value=item.pack_description or '')
+                for item_code, units, description, selling_price, pack_description in items.values_list(*cls_columns).iterator(chunk_size=2000):
+                    ws.cell(row=row_num, column=1, value=item_code)
+                    ws.cell(row=row_num, column=2, value=units)
+                    ws.cell(row=row_num, column=3, value=description)
+                    ws.cell(row=row_num, column=4, value=float(selling_price) if selling_price else 0)
+                    ws.cell(row=row_num, column=5, value=pack_description or '')
                     ws.cell(row=row_num, column=6, value=lock_display)
                     ws.cell(row=row_num, column=7, value='Central (All Outlets)')
                     row_num += 1
@@ -5255,26 +5736,18 @@ def export_locked_products_api(request):
                 
                 outlet = Outlet.objects.get(id=outlet_id, platforms=platform, is_active=True)
                 
-                if lock_type == 'bls_price':
-                    item_outlets = ItemOutlet.objects.filter(
-                        outlet=outlet, item__platform=platform, price_locked=True, is_active_in_outlet=True
-                    ).select_related('item').order_by('item__item_code')
-                    lock_display = 'BLS Price Lock'
-                else:
-                    item_outlets = ItemOutlet.objects.filter(
-                        outlet=outlet, item__platform=platform, status_locked=True, is_active_in_outlet=True
-                    ).select_related('item').order_by('item__item_code')
-                    lock_display = 'BLS Status Lock'
+                item_outlets = ItemOutlet.objects.filter(
+                    outlet=outlet, item__platform=platform, is_active_in_outlet=True, **{lock_field: True}
+                ).order_by('item__item_code')
                 
-                for io in item_outlets:
-                    item = io.item
-                    selling_price = io.outlet_selling_price or item.selling_price
+                for item_code, units, description, outlet_price, item_price, pack_description in item_outlets.values_list(*bls_columns).iterator(chunk_size=2000):
+                    selling_price = outlet_price or item_price
                     
-                    ws.cell(row=row_num, column=1, value=item.item_code)
-                    ws.cell(row=row_num, column=2, value=item.units)
-                    ws.cell(row=row_num, column=3, value=item.description)
+                    ws.cell(row=row_num, column=1, value=item_code)
+                    ws.cell(row=row_num, column=2, value=units)
+                    ws.cell(row=row_num, column=3, value=description)
                     ws.cell(row=row_num, column=4, value=float(selling_price) if selling_price else 0)
-                    ws.cell(row=row_num, column=5, value=item.pack_description or '')
+                    ws.cell(row=row_num, column=5, value=pack_description or '')
                     ws.cell(row=row_num, column=6, value=lock_display)
                     ws.cell(row=row_num, column=7, value=f'Branch ({outlet.name})')
                     ws.cell(row=row_num, column=8, value=outlet.name)
@@ -5308,20 +5781,15 @@ def export_locked_products_api(request):
             # Data
             if lock_type.startswith('cls'):
                 # CLS data
-                if lock_type == 'cls_price':
-                    items = Item.objects.filter(platform=platform, price_locked=True, is_active=True).order_by('item_code')
-                    lock_display = 'CLS Price Lock'
-                else:
-                    items = Item.objects.filter(platform=platform, status_locked=True, is_active=True).order_by('item_code')
-                    lock_display = 'CLS Status Lock'
+                items = Item.objects.filter(platform=platform, is_active=True, **{lock_field: True}).order_by('item_code')
                 
-                for item in items:
+                for item_code, units, description, selling_price, pack_description in items.values_list(*cls_columns).iterator(chunk_size=2000):
                     writer.writerow([
-                        item.item_code,
-                        item.units,
-                        item.description,
-                        float(item.selling_price) if item.selling_price else '',
-                        item.pack_description or '',
+                        item_code,
+                        units,
+                        description,
+                        float(selling_price) if selling_price else '',
+                        pack_description or '',
                         lock_display,
                         'Central (All Outlets)'
                     ])
@@ -5332,27 +5800,19 @@ def export_locked_products_api(request):
                 
                 outlet = Outlet.objects.get(id=outlet_id, platforms=platform, is_active=True)
                 
-                if lock_type == 'bls_price':
-                    item_outlets = ItemOutlet.objects.filter(
-                        outlet=outlet, item__platform=platform, price_locked=True, is_active_in_outlet=True
-                    ).select_related('item').order_by('item__item_code')
-                    lock_display = 'BLS Price Lock'
-                else:
-                    item_outlets = ItemOutlet.objects.filter(
-                        outlet=outlet, item__platform=platform, status_locked=True, is_active_in_outlet=True
-                    ).select_related('item').order_by('item__item_code')
-                    lock_display = 'BLS Status Lock'
+                item_outlets = ItemOutlet.objects.filter(
+                    outlet=outlet, item__platform=platform, is_active_in_outlet=True, **{lock_field: True}
+                ).order_by('item__item_code')
                 
-                for io in item_outlets:
-                    item = io.item
-                    selling_price = io.outlet_selling_price or item.selling_price
+                for item_code, units, description, outlet_price, item_price, pack_description in item_outlets.values_list(*bls_columns).iterator(chunk_size=2000):
+                    selling_price = outlet_price or item_price
                     
                     writer.writerow([
-                        item.item_code,
-                        item.units,
-                        item.description,
+                        item_code,
+                        units,
+                        description,
                         float(selling_price) if selling_price else '',
-                        item.pack_description or '',
+                        pack_description or '',
                         lock_display,
                         f'Branch ({outlet.name})',
                         outlet.name
@@ -5948,7 +6408,7 @@ def cost_finder_data_api(request):
         per_page = min(int(request.GET.get('per_page', 50)), 100)  # Max 100 per page
         
         # Validate platform (required for platform isolation)
-        if not platform or platform not in ('pasons', 'talabat'):
+        if not platform or platform not in VALID_PLATFORMS:
             return JsonResponse({
                 'success': False, 
                 'message': 'Platform selection is required. Please select Pasons or Talabat platform.'
@@ -5991,7 +6451,9 @@ def cost_finder_data_api(request):
             outlet_selling_price__gt=0,
             outlet_cost__isnull=False,
             outlet_cost__gt=0
-        ).select_related('item', 'outlet')
+        ).select_related('item', 'outlet').annotate(
+            calculated_enabled=outlet_enabled_status_expression()
+        )
         
         # Calculate GP percentage using database expressions
         # GP% = (selling_price - converted_cost) * 100 / selling_price
@@ -6076,9 +6538,8 @@ def cost_finder_data_api(request):
             elif gp_percentage < gp_threshold:
                 low_gp_count += 1
             
-            # Get stock status using existing business logic
-            # Use the same calculate_outlet_enabled_status function used throughout the project
-            stock_status_bool = calculate_outlet_enabled_status(item, item_outlet.outlet_stock)
+            # Stock status annotated by the database (outlet_enabled_status_expression)
+            stock_status_bool = item_outlet.calculated_enabled
             stock_status = "Active" if stock_status_bool else "Disabled"
             
             rows.append([
@@ -6167,7 +6628,7 @@ def export_cost_finder_api(request):
         export_format = request.POST.get('format', 'csv').strip()
         
         # Validate platform
-        if not platform or platform not in ('pasons', 'talabat'):
+        if not platform or platform not in VALID_PLATFORMS:
             return JsonResponse({'success': False, 'message': 'Valid platform is required'})
         
         # Validate outlet
@@ -6196,7 +6657,9 @@ def export_cost_finder_api(request):
             outlet_selling_price__gt=0,
             outlet_cost__isnull=False,
             outlet_cost__gt=0
-        ).select_related('item', 'outlet')
+        ).select_related('item', 'outlet').annotate(
+            calculated_enabled=outlet_enabled_status_expression()
+        )
         
         # Calculate GP and filter - show ALL products below threshold
         queryset = queryset.annotate(
@@ -6281,9 +6744,8 @@ def export_cost_finder_api(request):
                     gp_amount = Decimal('0')
                     gp_percentage = Decimal('0')
                 
-                # Get stock status using existing business logic
-                # Use the same calculate_outlet_enabled_status function used throughout the project
-                stock_status_bool = calculate_outlet_enabled_status(item, item_outlet.outlet_stock)
+                # Stock status annotated by the database (outlet_enabled_status_expression)
+                stock_status_bool = item_outlet.calculated_enabled
                 stock_status = "Active" if stock_status_bool else "Disabled"
                 
                 # Add row data - simplified for middleware ERP
@@ -6370,9 +6832,8 @@ def export_cost_finder_api(request):
                     gp_amount = Decimal('0')
                     gp_percentage = Decimal('0')
                 
-                # Get stock status using existing business logic
-                # Use the same calculate_outlet_enabled_status function used throughout the project
-                stock_status_bool = calculate_outlet_enabled_status(item, item_outlet.outlet_stock)
+                # Stock status annotated by the database (outlet_enabled_status_expression)
+                stock_status_bool = item_outlet.calculated_enabled
                 stock_status = "Active" if stock_status_bool else "Disabled"
                 
                 writer.writerow([